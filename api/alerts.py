@@ -21,13 +21,15 @@ async def get_alerts(user_id: int):
     user_subscriptions = (
         CompositeListenerManager.instance().get_user_subscriptions(user_id)
     )
+    # Статус соединения один на пользователя - считаем его вне цикла
+    is_connected = WebSocketManager.instance().is_connected(user_id)
 
     return [
         AlertResponse(
             alert_id=alert_id,
             expression=sub.readable_expression,
             subscribers_count=len(sub.subscribers),
-            is_websocket_connected=WebSocketManager.instance().is_connected(user_id)
+            is_websocket_connected=is_connected
         )
         for alert_id, sub in user_subscriptions.items()
     ]
@@ -40,6 +42,7 @@ async def get_all_alerts():
         List[AlertResponse]: Список всех алертов.
     """
     all_alerts = CompositeListenerManager.instance().all_alerts
+    is_connected = WebSocketManager.instance().is_connected
     
     return [
         AlertResponse(
@@ -47,7 +50,7 @@ async def get_all_alerts():
             expression=sub.readable_expression,
             subscribers_count=len(sub.subscribers),
             is_websocket_connected=any(
-                WebSocketManager.instance().is_connected(user_id) 
+                is_connected(user_id) 
                 for user_id in sub.subscribers
             )
         )
@@ -86,6 +89,8 @@ async def create_alert(request: AlertRequest):
                 {
                     "alert_id": listener.id,
                     "expression": listener.readable_expression,
+                    "subscribers_count": len(listener.subscribers),
+                    "is_websocket_connected": True,
                     "message": "Алерт успешно создан"
                 }
             )
@@ -217,19 +222,18 @@ async def subscribe_to_alert(alert_id: str, user_id: int):
     Returns:
         dict: Результат подписки.
     """
-    listener = CompositeListenerManager.instance().get_listener_by_id(alert_id)
+    manager = CompositeListenerManager.instance()
+    listener = manager.get_listener_by_id(alert_id)
     
     if not listener:
         raise HTTPException(status_code=404, detail=f"Алерт {alert_id} не найден")
     
-    if user_id in listener.subscribers:
+    if not await manager.subscribe(alert_id, user_id):
         return {
             "success": False,
             "message": "Вы уже подписаны на этот алерт"
         }
     
-    listener.add_subscriber(user_id)
-    
     # Отправляем уведомление через WebSocket если пользователь подключен
     if WebSocketManager.instance().is_connected(user_id):
         await WebSocketManager.instance().send_message(
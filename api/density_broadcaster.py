@@ -1,5 +1,6 @@
 import asyncio
 import msgpack
+import orjson
 import time
 from typing import Dict, Set, List, Tuple
 from fastapi import WebSocket
@@ -38,7 +39,9 @@ class DensityBroadcaster:
                 packed = msgpack.packb(data, use_bin_type=True)
                 await websocket.send_bytes(packed)
             else:
-                await websocket.send_json(data)
+                # Клиент страницы ордеров разбирает JSON из текстового кадра;
+                # orjson сериализует быстрее json.dumps из send_json
+                await websocket.send_text(orjson.dumps(data).decode())
         except Exception as e:
             logger.debug(f"[DENSITY_WS] Ошибка отправки: {e}")
             await self.disconnect(websocket)
@@ -151,7 +154,7 @@ class DensityBroadcaster:
     async def _safe_send(self, websocket: WebSocket, data: dict):
         """Безопасная отправка данных в websocket."""
         try:
-            await websocket.send_json(data)
+            await websocket.send_text(orjson.dumps(data).decode())
         except Exception as e:
             logger.debug(f"[DENSITY_WS] Ошибка отправки: {e}")
             await self.disconnect(websocket)
@@ -159,10 +162,11 @@ class DensityBroadcaster:
     async def _broadcast_to_all(self, message: dict):
         """Отправляет сообщение всем подключенным клиентам."""
         disconnected = set()
+        text = orjson.dumps(message).decode()
         
         for ws in list(self.connections):
             try:
-                await ws.send_json(message)
+                await ws.send_text(text)
             except:
                 disconnected.add(ws)
         
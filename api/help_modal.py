@@ -0,0 +1,213 @@
+from html import escape
+from typing import Any, Dict, List, Tuple
+
+from config import BASE_DIR
+
+HELP_MODAL_TEMPLATE = BASE_DIR / "static" / "help_modal.html"
+
+# Описание модулей для справочника: карточки строятся из этой таблицы,
+# а не набираются руками в разметке.
+MODULES: List[Dict[str, Any]] = [
+    {
+        "name": "price",
+        "type": "Цена",
+        "desc": "Отслеживает изменение цены за указанный временной интервал",
+        "syntax": "price <оператор> <процент> <окно> [период_проверки]",
+        "params": [
+            ("процент", "float", "Порог изменения цены в %"),
+            ("окно", "int", "Период расчета в секундах"),
+            ("период", "int", "Частота проверки (опционально)"),
+        ],
+        "example": ("price > 5 300 60", "+/-5% за 5 минут, проверка каждую минуту"),
+    },
+    {
+        "name": "volume",
+        "type": "Объем",
+        "desc": "Отслеживает абсолютный объем торгов в USD за временное окно",
+        "syntax": "volume <оператор> <сумма_USD> <окно> [период]",
+        "params": [
+            ("сумма_USD", "float", "Пороговый объем в долларах"),
+            ("окно", "int", "Период расчета в секундах"),
+            ("период", "int", "Частота проверки (опционально)"),
+        ],
+        "example": ("volume > 1000000 300 60", ">1M USD за 5 минут, проверка каждую минуту"),
+    },
+    {
+        "name": "volume_change",
+        "type": "Изм. объема",
+        "desc": "Сравнивает объем торгов между двумя соседними временными окнами",
+        "syntax": "volume_change <оператор> <процент> <окно> [период]",
+        "params": [
+            ("процент", "float", "Порог изменения объема в %"),
+            ("окно", "int", "Размер окна сравнения в секундах"),
+            ("период", "int", "Частота проверки (опционально)"),
+        ],
+        "example": ("volume_change > 100 1800 60", "+100% за 30 минут"),
+    },
+    {
+        "name": "oi",
+        "type": "Откр. интерес",
+        "desc": "Отслеживает изменение открытого интереса относительно медианы за 24 часа",
+        "syntax": "oi <оператор> <процент>",
+        "params": [
+            ("процент", "float", "Отклонение от медианы в %"),
+        ],
+        "example": ("oi > 200", "OI вырос на 200% от медианы"),
+    },
+    {
+        "name": "oi_sum",
+        "type": "Абс. OI",
+        "desc": "Проверяет абсолютное значение открытого интереса в USD",
+        "syntax": "oi_sum <оператор> <сумма_USD>",
+        "params": [
+            ("сумма_USD", "float", "Пороговое значение OI в долларах"),
+        ],
+        "example": ("oi_sum > 3000000000", "OI больше 3 MЛРД USD"),
+    },
+    {
+        "name": "funding",
+        "type": "Фандинг",
+        "desc": "Отслеживает фандинг ставки перед расчетом",
+        "syntax": "funding <оператор> <процент> <время_до_расчета>",
+        "params": [
+            ("процент", "float", "Абсолютное значение ставки в %"),
+            ("время", "int", "Макс. время до расчета в секундах"),
+        ],
+        "example": ("funding > 1 3600", "|funding| >= 1% за час до расчета"),
+    },
+    {
+        "name": "order",
+        "type": "Ордера",
+        "desc": "Отслеживает крупные ордера в стакане, которые держатся определенное время",
+        "syntax": "order <оператор> <размер_USD> <макс_%_откл> <мин_длительность>",
+        "params": [
+            ("размер_USD", "float", "Минимальный размер ордера в USD(от 200 000 USD)"),
+            ("макс_%", "float", "Максимальное отклонение от цены в % (от 0 до 10%)"),
+            ("длительность", "int", "Минимальное время жизни в секундах"),
+        ],
+        "example": ("order > 1000000 5 300", "Ордер >1M USD, ±5% от цены, >5 минут"),
+    },
+    {
+        "name": "order_num",
+        "type": "Кол-во сделок",
+        "desc": "Отслеживает процентное изменение количества сделок между двумя соседними временными окнами",
+        "syntax": "order_num <оператор> <процент> <окно> [период]",
+        "params": [
+            ("процент", "float", "Порог изменения количества сделок в %"),
+            ("окно", "int", "Размер окна сравнения в секундах"),
+            ("период", "int", "Частота проверки (опционально, по умолчанию 60 сек)"),
+        ],
+        "example": ("order_num > 150 900 60", "+150% сделок за 15 минут"),
+    },
+]
+
+# Практические примеры: (заголовок группы, [(выражение, комментарий), ...])
+EXAMPLES: List[Tuple[str, List[Tuple[str, str]]]] = [
+    ("Простые условия:", [
+        ("price > 3 300 60", "Цена изменилась на ±3% за 5 минут"),
+        ("volume > 5000000 600", "Объем >5M USD за 10 минут"),
+        ("oi > 250", "OI вырос на 250% от медианы"),
+        ("order_num > 200 600 60", "Количество сделок увеличилось на 200% за 10 минут"),
+    ]),
+    ("Сложные условия с логикой:", [
+        ("price > 2 180 60 & volume > 2000000 180", "Цена И объем одновременно"),
+        ("oi > 100 | funding > 1.5 1800", "OI ИЛИ высокий фандинг"),
+        ("price > 3 300 60 & order_num > 100 300 60", "Цена И активность сделок"),
+        ("(price > 5 300 & volume > 1000000 300) | oi > 300", "Группировка со скобками"),
+    ]),
+    ("С задержкой (cooldown):", [
+        ("price > 10 60 @300", "Сильное движение цены, не чаще раза в 5 минут"),
+        ("volume_change > 500 900 60 @600", "Взрывной рост объема, cooldown 10 минут"),
+    ]),
+]
+
+
+def _render_example(expression: str, comment: str) -> str:
+    """Рендерит блок примера с кнопкой копирования.
+
+    Текст выражения выводится один раз: кнопка копирует содержимое
+    соседнего <code class="ex"> через делегированный обработчик.
+
+    Args:
+        expression: Выражение алерта.
+        comment: Пояснение к примеру.
+
+    Returns:
+        str: HTML блока .example-box.
+    """
+    return (
+        '<div class="card example-box">'
+        '<div class="example-content">'
+        f'<code class="ex">{escape(expression)}</code> '
+        f'<span class="example-comment">// {escape(comment)}</span>'
+        '</div>'
+        '<button class="copy-btn-modal">Copy</button>'
+        '</div>'
+    )
+
+
+def _render_module_card(module: Dict[str, Any]) -> str:
+    """Рендерит карточку модуля справочника.
+
+    Args:
+        module: Описание модуля из таблицы MODULES.
+
+    Returns:
+        str: HTML карточки .module-card.
+    """
+    rows = "".join(
+        f'<dt class="param-name">{escape(name)}</dt>'
+        f'<dd class="param-type">{escape(kind)}</dd>'
+        f'<dd>{escape(desc)}</dd>'
+        for name, kind, desc in module["params"]
+    )
+    return (
+        '<div class="card module-card">'
+        '<div class="module-header-help">'
+        f'<span class="module-name">{escape(module["name"])}</span>'
+        f'<span class="module-type">{escape(module["type"])}</span>'
+        '</div>'
+        f'<div class="module-description">{escape(module["desc"])}</div>'
+        '<div class="syntax-box">'
+        '<div class="syntax-title">Синтаксис:</div>'
+        f'{escape(module["syntax"])}'
+        '</div>'
+        f'<dl class="param-grid">{rows}</dl>'
+        f'{_render_example(*module["example"])}'
+        '</div>'
+    )
+
+
+def _render_examples() -> str:
+    """Рендерит группы практических примеров.
+
+    Returns:
+        str: HTML содержимого .examples-section.
+    """
+    return "".join(
+        f'<h3>{escape(title)}</h3>' + "".join(_render_example(*item) for item in items)
+        for title, items in EXAMPLES
+    )
+
+
+def render_help_modal(stylesheet_url: str) -> str:
+    """Собирает разметку модального справочника.
+
+    Каркас берется из static/help_modal.html, карточки модулей и примеры
+    подставляются из таблиц MODULES и EXAMPLES.
+
+    Args:
+        stylesheet_url: Версионированный URL стилей модала; ссылка на них
+            идет первой строкой фрагмента, клиент подключает ее вместе
+            с разметкой.
+
+    Returns:
+        str: Готовый HTML фрагмент модального окна.
+    """
+    template = HELP_MODAL_TEMPLATE.read_text(encoding="utf-8")
+    return (
+        template
+        .replace("<!-- @stylesheet -->", f'<link rel="stylesheet" href="{escape(stylesheet_url)}">')
+        .replace("<!-- @module-cards -->", "".join(_render_module_card(m) for m in MODULES))
+        .replace("<!-- @examples -->", _render_examples())
+    )
@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+import brotli
+from fastapi import Request
+from fastapi.responses import Response
+
+from config import BASE_DIR
+from .help_modal import render_help_modal
+
+STATIC_DIR = BASE_DIR / "static"
+
+# Префикс, под которым роутер api.ws подключён в main.py
+STATIC_URL_PREFIX = "/ws/static"
+
+# Кэш-заголовки: версионированный URL неизменяем, остальное - с ревалидацией
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+class StaticAsset:
+    """Статический ресурс, заранее сжатый в памяти (brotli и gzip).
+
+    Содержимое читается и сжимается один раз при импорте модуля, поэтому
+    обработчик запроса только выбирает готовый вариант по Accept-Encoding
+    и не тратит CPU на кодирование и сжатие.
+
+    Attributes:
+        media_type: MIME-тип ресурса.
+        version: Короткий хэш содержимого для версионирования URL.
+        etag: Слабый ETag содержимого (одинаков для всех вариантов сжатия).
+        url: Версионированный URL ресурса (если ресурс зарегистрирован).
+        _variants: Словарь вариантов тела по content-encoding
+            ("br", "gzip", "identity").
+    """
+
+    def __init__(self, body: bytes, media_type: str) -> None:
+        """Инициализирует ресурс и строит сжатые варианты.
+
+        Args:
+            body: Исходное содержимое ресурса.
+            media_type: MIME-тип ресурса.
+        """
+        self.media_type = media_type
+        self.version = hashlib.md5(body).hexdigest()[:8]
+        self.etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        self.url = ""
+        self._variants: Dict[str, bytes] = {
+            "br": brotli.compress(body, quality=11),
+            "gzip": gzip.compress(body, compresslevel=9),
+            "identity": body,
+        }
+
+    @classmethod
+    def from_file(cls, path: Path, media_type: str = "text/html; charset=utf-8") -> "StaticAsset":
+        """Создаёт ресурс из файла на диске.
+
+        Args:
+            path: Путь к файлу.
+            media_type: MIME-тип ресурса.
+
+        Returns:
+            StaticAsset: Готовый к отдаче ресурс.
+        """
+        return cls(path.read_bytes(), media_type)
+
+    def _pick_encoding(self, accept_encoding: str) -> str:
+        """Выбирает лучший поддерживаемый клиентом вариант сжатия.
+
+        Учитывает q-значения: кодировка с q=0 (явно или через ``*;q=0``)
+        недопустима. Из допустимых выбирается вариант с наибольшим q, при
+        равных - br, затем gzip; если сжатие не принимается - identity.
+
+        Args:
+            accept_encoding: Значение заголовка Accept-Encoding.
+
+        Returns:
+            str: Ключ варианта ("br", "gzip" или "identity").
+        """
+        weights: Dict[str, float] = {}
+        for token in accept_encoding.split(","):
+            coding, _, params = token.partition(";")
+            coding = coding.strip().lower()
+            if not coding:
+                continue
+            weight = 1.0
+            for param in params.split(";"):
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        weight = float(value)
+                    except ValueError:
+                        weight = 0.0
+            weights[coding] = weight
+
+        wildcard = weights.get("*", 0.0)
+        best, best_weight = "identity", 0.0
+        for encoding in ("br", "gzip"):
+            weight = weights.get(encoding, wildcard)
+            if weight > best_weight:
+                best, best_weight = encoding, weight
+        return best
+
+    def _is_not_modified(self, if_none_match: str) -> bool:
+        """Проверяет заголовок If-None-Match (слабое сравнение ETag).
+
+        Args:
+            if_none_match: Значение заголовка If-None-Match.
+
+        Returns:
+            bool: True, если у клиента актуальная версия ресурса.
+        """
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        opaque = self.etag[2:]
+        return any(
+            tag.strip().removeprefix("W/") == opaque
+            for tag in if_none_match.split(",")
+        )
+
+    def response(self, request: Request) -> Response:
+        """Формирует ответ с подходящим для клиента вариантом тела.
+
+        Args:
+            request: Входящий HTTP запрос.
+
+        Note:
+            Запрос с актуальной версией (?v=<version>) кэшируется браузером
+            навсегда, остальные запросы требуют ревалидации. При совпадении
+            If-None-Match с ETag возвращается пустой 304.
+
+        Returns:
+            Response: Ответ с готовыми байтами и заголовками Vary/Cache-Control.
+        """
+        encoding = self._pick_encoding(request.headers.get("accept-encoding", ""))
+        versioned = request.query_params.get("v") == self.version
+        headers = {
+            "Vary": "Accept-Encoding",
+            "Cache-Control": IMMUTABLE_CACHE if versioned else REVALIDATE_CACHE,
+            "ETag": self.etag,
+        }
+        if self._is_not_modified(request.headers.get("if-none-match", "")):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=self._variants[encoding],
+            media_type=self.media_type,
+            headers=headers,
+        )
+
+
+ASSETS: Dict[str, StaticAsset] = {}
+
+
+def register_asset(filename: str, media_type: str, body: Optional[bytes] = None) -> StaticAsset:
+    """Загружает файл из static/ и регистрирует его для отдачи по имени.
+
+    Args:
+        filename: Имя файла в каталоге static.
+        media_type: MIME-тип ресурса.
+        body: Готовое содержимое (если ресурс собирается в коде, а не
+            читается с диска).
+
+    Returns:
+        StaticAsset: Зарегистрированный ресурс с заполненным url.
+    """
+    if body is None:
+        asset = StaticAsset.from_file(STATIC_DIR / filename, media_type)
+    else:
+        asset = StaticAsset(body, media_type)
+    asset.url = f"{STATIC_URL_PREFIX}/{filename}?v={asset.version}"
+    ASSETS[filename] = asset
+    return asset
+
+
+HELP_MODAL_CSS = register_asset("help_modal.css", "text/css; charset=utf-8")
+HELP_MODAL = register_asset(
+    "help_modal.html", "text/html; charset=utf-8", render_help_modal(HELP_MODAL_CSS.url).encode()
+)
+DEMO_CSS = register_asset("ws.css", "text/css; charset=utf-8")
+DEMO_JS = register_asset("ws.js", "text/javascript; charset=utf-8")
+MSGPACK_JS = register_asset("msgpack.js", "text/javascript; charset=utf-8")
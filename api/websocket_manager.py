@@ -1,9 +1,13 @@
-import json
 import asyncio
-from typing import Dict, Set
+from typing import Dict, List, Optional, Set, Tuple
+
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketState
-from config import logger
+from config import WS_BATCH_WINDOW_MS, logger
+from .ws_codec import encode_json, encode_msgpack
+
+# Максимум событий в одном конверте (столько же ожидает клиент)
+BATCH_MAX_ITEMS = 128
 
 
 class WebSocketManager:
@@ -16,7 +20,10 @@ class WebSocketManager:
     Attributes:
         _instance: Единственный экземпляр менеджера (Singleton).
         _connections: Словарь активных WebSocket соединений по user_id.
+        _msgpack_users: Пользователи, запросившие бинарные кадры MessagePack.
         _lock: Асинхронная блокировка для потокобезопасности.
+        _pending: Алерты текущего окна склейки с их получателями.
+        _flush_task: Задача, отправляющая накопленные алерты по окончании окна.
     """
     
     _instance = None
@@ -24,7 +31,10 @@ class WebSocketManager:
     def __init__(self):
         """Инициализирует менеджер WebSocket соединений."""
         self._connections: Dict[int, WebSocket] = {}
+        self._msgpack_users: Set[int] = set()
         self._lock = asyncio.Lock()
+        self._pending: List[Tuple[Set[int], dict]] = []
+        self._flush_task: Optional[asyncio.Task[None]] = None
     
     @classmethod
     def instance(cls) -> "WebSocketManager":
@@ -53,7 +63,7 @@ class WebSocketManager:
         except Exception as exc:
             logger.warning(f"[WS] Ошибка закрытия соединения {user_id}: {exc}")
     
-    async def connect(self, websocket: WebSocket, user_id: int) -> None:
+    async def connect(self, websocket: WebSocket, user_id: int, use_msgpack: bool = False) -> None:
         """Подключает пользователя к WebSocket.
         
         Принимает новое WebSocket соединение и связывает его с пользователем.
@@ -62,6 +72,8 @@ class WebSocketManager:
         Args:
             websocket: WebSocket соединение для подключения.
             user_id: Уникальный идентификатор пользователя.
+            use_msgpack: Отправлять сообщения бинарными кадрами MessagePack
+                вместо текстового JSON.
             
         Raises:
             Exception: При ошибке закрытия старого соединения.
@@ -74,43 +86,77 @@ class WebSocketManager:
                 await self._safe_close_websocket(old_ws, user_id)
             
             self._connections[user_id] = websocket
+            if use_msgpack:
+                self._msgpack_users.add(user_id)
+            else:
+                self._msgpack_users.discard(user_id)
         
         logger.info(f"[WS] Пользователь {user_id} подключен")
     
-    async def disconnect(self, user_id: int) -> None:
-        """Отключает пользователя от WebSocket.
+    def _forget(self, user_id: int, websocket: WebSocket) -> bool:
+        """Удаляет соединение из реестра, если оно все еще актуально.
+
+        Вызывается под ``self._lock``. Пользователь мог переподключиться,
+        пока шла отправка или закрытие: новое соединение не трогаем.
+
+        Args:
+            user_id: Уникальный идентификатор пользователя.
+            websocket: Соединение, которое нужно забыть.
+
+        Returns:
+            bool: True если соединение было удалено из реестра.
+        """
+        if self._connections.get(user_id) is not websocket:
+            return False
+        del self._connections[user_id]
+        self._msgpack_users.discard(user_id)
+        return True
+
+    async def disconnect(self, user_id: int, websocket: WebSocket) -> None:
+        """Отключает соединение пользователя от WebSocket.
         
-        Закрывает соединение пользователя и удаляет его из списка активных
-        соединений.
+        Закрывает соединение и удаляет его из списка активных, только если
+        оно не было заменено более новым подключением того же пользователя.
         
         Args:
             user_id: Уникальный идентификатор пользователя для отключения.
+            websocket: Соединение, которое завершается.
             
         Raises:
             Exception: При ошибке закрытия соединения.
         """
         async with self._lock:
-            websocket = self._connections.pop(user_id, None)
-            if websocket:
-                await self._safe_close_websocket(websocket, user_id)
+            if not self._forget(user_id, websocket):
+                logger.debug(f"[WS] Соединение пользователя {user_id} уже заменено новым")
+                return
+            await self._safe_close_websocket(websocket, user_id)
         
         logger.info(f"[WS] Пользователь {user_id} отключен")
     
-    async def send_alert(self, user_id: int, alert_data: dict) -> bool:
-        """Отправляет алерт конкретному пользователю.
-        
-        Сериализует данные алерта в JSON и отправляет через WebSocket.
+    def encode_frames(self, data: dict) -> Tuple[bytes, Optional[bytes]]:
+        """Сериализует сообщение один раз для всех получателей.
+
+        Args:
+            data: Словарь с данными сообщения.
+
+        Returns:
+            Tuple[bytes, Optional[bytes]]: Кадр JSON и кадр MessagePack
+                (None, если MessagePack-клиентов сейчас нет).
+        """
+        msgpack_frame = encode_msgpack(data) if self._msgpack_users else None
+        return encode_json(data), msgpack_frame
+
+    async def send_raw(self, user_id: int, frame: bytes) -> bool:
+        """Отправляет пользователю уже сериализованный кадр.
+
         Автоматически удаляет неактивные соединения.
-        
+
         Args:
             user_id: Уникальный идентификатор пользователя.
-            alert_data: Словарь с данными алерта для отправки.
-            
+            frame: Готовый кадр в формате, выбранном пользователем.
+
         Returns:
-            bool: True если алерт успешно отправлен, False в противном случае.
-            
-        Raises:
-            Exception: При ошибке сериализации или отправки данных.
+            bool: True если кадр успешно отправлен, False в противном случае.
         """
         async with self._lock:
             websocket = self._connections.get(user_id)
@@ -122,48 +168,180 @@ class WebSocketManager:
         if websocket.client_state != WebSocketState.CONNECTED:
             logger.debug(f"[WS] Соединение с пользователем {user_id} не активно")
             async with self._lock:
-                self._connections.pop(user_id, None)
+                self._forget(user_id, websocket)
             return False
         
         try:
-            await websocket.send_text(json.dumps(alert_data, ensure_ascii=False))
+            await websocket.send_bytes(frame)
             logger.debug(f"[WS] Алерт отправлен пользователю {user_id}")
             return True
         except Exception as exc:
             logger.exception(f"[WS] Ошибка отправки пользователю {user_id}: {exc}")
             async with self._lock:
-                self._connections.pop(user_id, None)
+                self._forget(user_id, websocket)
             return False
-    
-    async def broadcast_alert(self, user_ids: Set[int], alert_data: dict) -> int:
-        """Отправляет алерт группе пользователей.
+
+    async def send_alert(self, user_id: int, alert_data: dict) -> bool:
+        """Отправляет алерт конкретному пользователю.
         
-        Параллельно отправляет алерт всем указанным пользователям и возвращает
-        количество успешно доставленных сообщений.
+        Сериализует данные алерта в JSON через orjson (или MessagePack, если
+        клиент запросил его) и отправляет бинарным кадром через WebSocket.
         
         Args:
-            user_ids: Множество идентификаторов пользователей для отправки.
+            user_id: Уникальный идентификатор пользователя.
             alert_data: Словарь с данными алерта для отправки.
             
+        Returns:
+            bool: True если алерт успешно отправлен, False в противном случае.
+        """
+        if user_id in self._msgpack_users:
+            frame = encode_msgpack(alert_data)
+        else:
+            frame = encode_json(alert_data)
+        return await self.send_raw(user_id, frame)
+
+    async def broadcast_raw(
+        self, user_ids: Set[int], json_frame: bytes, msgpack_frame: Optional[bytes] = None
+    ) -> int:
+        """Рассылает группе пользователей заранее сериализованный кадр.
+
+        Args:
+            user_ids: Множество идентификаторов пользователей для отправки.
+            json_frame: Кадр JSON.
+            msgpack_frame: Кадр MessagePack для клиентов, выбравших этот формат.
+
         Returns:
             int: Количество успешно доставленных сообщений.
-            
-        Raises:
-            Exception: При ошибке отправки сообщений пользователям.
         """
         if not user_ids:
             return 0
-            
-        tasks = []
-        for user_id in user_ids:
-            tasks.append(self.send_alert(user_id, alert_data))
-        
+
+        # Один захват блокировки на всю рассылку вместо захвата в send_raw
+        # на каждого получателя
+        async with self._lock:
+            targets = [
+                (user_id, websocket)
+                for user_id in user_ids
+                if (websocket := self._connections.get(user_id)) is not None
+            ]
+
+        tasks = [
+            websocket.send_bytes(
+                msgpack_frame if msgpack_frame is not None and user_id in self._msgpack_users else json_frame
+            )
+            if websocket.client_state == WebSocketState.CONNECTED
+            else self._inactive(user_id)
+            for user_id, websocket in targets
+        ]
+
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        successful = sum(1 for r in results if r is True)
-        
-        logger.info(f"[WS] Алерт отправлен {successful}/{len(tasks)} пользователям")
+        failed = []
+        for target, result in zip(targets, results):
+            if result is None:
+                continue
+            failed.append(target)
+            if isinstance(result, BaseException):
+                logger.warning(
+                    f"[WS] Ошибка отправки пользователю {target[0]}: {result!r}",
+                    exc_info=result,
+                )
+        successful = len(targets) - len(failed)
+
+        if failed:
+            logger.info(f"[WS] Удаляем неактивные соединения: {[user_id for user_id, _ in failed]}")
+            async with self._lock:
+                for user_id, websocket in failed:
+                    self._forget(user_id, websocket)
+
+        logger.info(f"[WS] Алерт отправлен {successful}/{len(user_ids)} пользователям")
         return successful
     
+    @staticmethod
+    async def _inactive(user_id: int) -> bool:
+        """Заглушка для закрытого соединения в рассылке: помечает его как неудачное.
+
+        Args:
+            user_id: Идентификатор пользователя с неактивным соединением.
+
+        Returns:
+            bool: Всегда False (send_bytes при успехе возвращает None).
+        """
+        logger.debug(f"[WS] Соединение с пользователем {user_id} не активно")
+        return False
+
+    async def broadcast_alert(self, user_ids: Set[int], alert_data: dict) -> int:
+        """Ставит алерт в очередь на отправку группе пользователей.
+        
+        Алерты, пришедшие в течение WS_BATCH_WINDOW_MS, склеиваются: каждый
+        пользователь получает их одним кадром вместо кадра на алерт.
+        
+        Args:
+            user_ids: Множество идентификаторов пользователей для отправки.
+            alert_data: Словарь с данными алерта для отправки.
+            
+        Returns:
+            int: Количество подключенных получателей, которым алерт
+                поставлен в очередь.
+        """
+        if not user_ids:
+            return 0
+        # Копия: множество подписчиков может измениться до конца окна
+        self._pending.append((set(user_ids), alert_data))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_pending())
+        return sum(1 for user_id in user_ids if user_id in self._connections)
+
+    async def _flush_pending(self) -> None:
+        """Отправляет алерты, накопленные за окно склейки.
+
+        Пользователи с одинаковым набором алертов объединяются в группу,
+        и кадр для группы сериализуется один раз. Одиночный алерт уходит
+        как обычное сообщение, несколько - конвертом {type: 'batch', items};
+        больше BATCH_MAX_ITEMS событий разбиваются на несколько конвертов,
+        которые отправляются по порядку. Группы одного раунда рассылаются
+        параллельно, чтобы медленный получатель не задерживал остальных.
+        """
+        await asyncio.sleep(WS_BATCH_WINDOW_MS / 1000)
+        pending, self._pending = self._pending, []
+        self._flush_task = None
+
+        per_user: Dict[int, List[int]] = {}
+        for index, (user_ids, _) in enumerate(pending):
+            for user_id in user_ids:
+                per_user.setdefault(user_id, []).append(index)
+
+        # rounds[k] - k-е по счету конверты пользователей, сгруппированные
+        # по составу: так порядок алертов у каждого пользователя сохраняется
+        rounds: List[Dict[Tuple[int, ...], Set[int]]] = []
+        for user_id, indices in per_user.items():
+            for number, start in enumerate(range(0, len(indices), BATCH_MAX_ITEMS)):
+                if number == len(rounds):
+                    rounds.append({})
+                chunk = tuple(indices[start:start + BATCH_MAX_ITEMS])
+                rounds[number].setdefault(chunk, set()).add(user_id)
+
+        for groups in rounds:
+            sends = []
+            for chunk, user_ids in groups.items():
+                items = [pending[index][1] for index in chunk]
+                data = items[0] if len(items) == 1 else {"type": "batch", "items": items}
+                try:
+                    frames = self.encode_frames(data)
+                except Exception as exc:
+                    logger.exception(f"[WS] Ошибка сериализации пачки алертов: {exc}")
+                    continue
+                sends.append(self.broadcast_raw(user_ids, *frames))
+
+            # Следующий раунд - только после текущего: у пользователя
+            # конверты должны приходить по порядку
+            results = await asyncio.gather(*sends, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.error(
+                        f"[WS] Ошибка отправки пачки алертов: {result!r}",
+                        exc_info=result,
+                    )
+    
     def get_connected_users(self) -> Set[int]:
         """Получает список подключенных пользователей.
         
@@ -172,6 +350,15 @@ class WebSocketManager:
         """
         return set(self._connections.keys())
     
+    @property
+    def connected_count(self) -> int:
+        """Количество подключенных пользователей без построения множества.
+
+        Returns:
+            int: Число открытых соединений.
+        """
+        return len(self._connections)
+
     def is_connected(self, user_id: int) -> bool:
         """Проверяет подключен ли пользователь.
         
@@ -0,0 +1,87 @@
+import datetime as dt
+import time
+from typing import Any, Dict, List
+
+import msgpack
+import orjson
+
+# Общий набор опций orjson для всех кадров: naive datetime считаются UTC
+# и рендерятся в RFC 3339 (с суффиксом Z) прямо в C-энкодере.
+ORJSON_OPT: int = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# Метка времени кадров кэшируется на _TS_TTL секунд: клиентам не нужна
+# микросекундная точность, а datetime + форматирование на каждый кадр
+# (и на каждого получателя рассылки) заметны под нагрузкой.
+_TS_TTL: float = 0.05
+_ts_cache: List[Any] = [0.0, ""]
+
+
+def _fast_iso(t: float) -> str:
+    """Форматирует unix-время в ISO 8601 UTC без создания datetime.
+
+    Args:
+        t: Время в секундах (time.time()).
+
+    Returns:
+        str: Строка вида 2024-01-01T12:00:00.123456Z.
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + f".{int(t % 1 * 1_000_000):06d}Z"
+
+
+def now_iso() -> str:
+    """Возвращает текущее время UTC в ISO 8601 (с суффиксом Z), кэшируя строку.
+
+    Returns:
+        str: Метка времени, обновляемая не чаще раза в _TS_TTL секунд.
+    """
+    t = time.time()
+    if t - _ts_cache[0] > _TS_TTL:
+        _ts_cache[0] = t
+        _ts_cache[1] = _fast_iso(t)
+    return _ts_cache[1]
+
+
+def msgpack_default(obj: Any) -> Any:
+    """Приводит типы, которых нет в MessagePack, к сериализуемым.
+
+    Args:
+        obj: Объект, который msgpack не умеет упаковать.
+
+    Returns:
+        Any: Строка RFC 3339 в UTC с суффиксом Z для datetime: naive
+            значения считаются UTC (как OPT_NAIVE_UTC в JSON-кадрах),
+            aware переводятся в UTC, а не получают Z поверх смещения.
+
+    Raises:
+        TypeError: Если тип не поддерживается.
+    """
+    if isinstance(obj, dt.datetime):
+        if obj.tzinfo is not None:
+            obj = obj.astimezone(dt.timezone.utc).replace(tzinfo=None)
+        return obj.isoformat() + "Z"
+    raise TypeError(f"Unsupported type: {type(obj)!r}")
+
+
+def encode_json(payload: Dict[str, Any]) -> bytes:
+    """Сериализует сообщение WebSocket через orjson с общими опциями.
+
+    Args:
+        payload: Словарь с данными сообщения.
+
+    Returns:
+        bytes: JSON в UTF-8, готовый к отправке бинарным кадром без
+            промежуточного decode/encode строки.
+    """
+    return orjson.dumps(payload, option=ORJSON_OPT)
+
+
+def encode_msgpack(payload: Dict[str, Any]) -> bytes:
+    """Сериализует сообщение WebSocket в MessagePack.
+
+    Args:
+        payload: Словарь с данными сообщения.
+
+    Returns:
+        bytes: Кадр MessagePack.
+    """
+    return msgpack.packb(payload, use_bin_type=True, default=msgpack_default)
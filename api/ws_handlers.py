@@ -0,0 +1,344 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import msgpack
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+
+from config import logger
+from modules.composite.manager import CompositeListenerManager
+from .websocket_manager import WebSocketManager
+from .ws_codec import encode_json, encode_msgpack, now_iso
+
+# Модуль не содержит декораторов FastAPI и полностью аннотирован, поэтому
+# его можно собрать mypyc на месте (`mypyc api/ws_handlers.py`): вызовы
+# обработчиков на каждое сообщение станут прямыми C-вызовами.
+
+# Период серверного heartbeat: клиент отвечает на {"type": "ping"} сообщением
+# {"type": "pong"}, а простаивающие прокси не рвут соединение.
+HEARTBEAT_INTERVAL: float = 20.0
+
+
+class _StaticFrame:
+    """Кадр с постоянным содержимым, сериализованный заранее.
+
+    Поля кадра сериализуются один раз при импорте в оба формата; на отправке
+    к готовому префиксу дописывается только текущая метка времени, которая
+    стоит последним полем.
+    """
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        """Строит префиксы кадра для JSON и MessagePack.
+
+        Args:
+            payload: Постоянные поля кадра (без timestamp).
+        """
+        stub: Dict[str, Any] = {**payload, "timestamp": ""}
+        # JSON заканчивается на '"timestamp":""}' - отрезаем '"}'
+        self._json_prefix: bytes = encode_json(stub)[:-2]
+        # В MessagePack пустая строка - один байт 0xa0 в конце
+        self._msgpack_prefix: bytes = encode_msgpack(stub)[:-1]
+
+    def render(self, use_msgpack: bool) -> bytes:
+        """Собирает кадр с текущей меткой времени.
+
+        Args:
+            use_msgpack: Формат кадра, выбранный клиентом.
+
+        Returns:
+            bytes: Готовый к отправке кадр.
+        """
+        timestamp = now_iso()
+        if use_msgpack:
+            return self._msgpack_prefix + msgpack.packb(timestamp)
+        return self._json_prefix + timestamp.encode() + b'"}'
+
+
+_PONG_FRAME = _StaticFrame({"type": "pong"})
+_BAD_JSON_FRAME = _StaticFrame({"type": "error", "message": "Неверный формат JSON"})
+_INTERNAL_ERROR_FRAME = _StaticFrame({"type": "error", "message": "Внутренняя ошибка сервера"})
+
+
+async def _send(websocket: WebSocket, use_msgpack: bool, payload: Dict[str, Any]) -> None:
+    """Отправляет сообщение в формате, выбранном клиентом при подключении.
+
+    Args:
+        websocket: WebSocket соединение.
+        use_msgpack: True - MessagePack, иначе JSON (тоже бинарным кадром:
+            клиент различает форматы по первому байту).
+        payload: Словарь с данными сообщения.
+    """
+    if use_msgpack:
+        await websocket.send_bytes(encode_msgpack(payload))
+    else:
+        await websocket.send_bytes(encode_json(payload))
+
+
+async def _receive(websocket: WebSocket) -> Union[str, bytes]:
+    """Принимает кадр клиента как есть: текстовый или бинарный.
+
+    Args:
+        websocket: WebSocket соединение.
+
+    Returns:
+        Union[str, bytes]: Содержимое кадра (orjson.loads принимает оба типа).
+
+    Raises:
+        WebSocketDisconnect: Если клиент закрыл соединение.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    text = message.get("text")
+    return text if text is not None else message["bytes"]
+
+
+def _parse_message(data: Union[str, bytes]) -> Dict[str, Any]:
+    """Разбирает кадр клиента: JSON (текст или байты) либо MessagePack.
+
+    Бинарный кадр, начинающийся не с '{' или '[', считается MessagePack.
+
+    Args:
+        data: Содержимое кадра.
+
+    Returns:
+        Dict[str, Any]: Команда клиента.
+
+    Raises:
+        ValueError: Если кадр не разбирается (ошибки orjson и msgpack -
+            подклассы ValueError).
+    """
+    if isinstance(data, bytes) and data[:1] not in (b"{", b"["):
+        return msgpack.unpackb(data, raw=False)
+    return orjson.loads(data)
+
+
+async def _heartbeat(websocket: WebSocket, use_msgpack: bool) -> None:
+    """Периодически отправляет клиенту ping, пока соединение открыто.
+
+    Args:
+        websocket: WebSocket соединение.
+        use_msgpack: Формат кадров, выбранный клиентом.
+
+    Note:
+        Ошибка отправки означает разорванное соединение: задача тихо
+        завершается, отключение обрабатывает serve_alerts_connection.
+    """
+    while True:
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        try:
+            await _send(websocket, use_msgpack, {
+                "type": "ping",
+                "timestamp": now_iso()
+            })
+        except (WebSocketDisconnect, RuntimeError, OSError):
+            # OSError - ClientDisconnected uvicorn при записи в закрытый сокет
+            return
+
+
+async def serve_alerts_connection(websocket: WebSocket, user_id: int) -> None:
+    """Обслуживает WebSocket соединение пользователя от подключения до отключения.
+
+    Создает WebSocket соединение для пользователя и обрабатывает входящие сообщения.
+    Отправляет приветственное сообщение, статистику пользователя и обрабатывает команды.
+
+    Args:
+        websocket: WebSocket соединение от клиента.
+        user_id: Уникальный идентификатор пользователя.
+
+    Note:
+        - Формат исходящих кадров выбирается параметром ?format=msgpack
+          (MessagePack), по умолчанию - JSON; входящие команды принимаются
+          в любом из двух форматов
+        - Каждые HEARTBEAT_INTERVAL секунд отправляет ping
+        - Отправляет приветственное сообщение при подключении
+        - Отправляет статистику пользователя
+        - Обрабатывает команды ping, get_status, get_my_alerts
+        - Автоматически отключает пользователя при ошибках
+    """
+    use_msgpack: bool = websocket.query_params.get("format") == "msgpack"
+    manager: CompositeListenerManager = CompositeListenerManager.instance()
+    ws_manager: WebSocketManager = WebSocketManager.instance()
+    await ws_manager.connect(websocket, user_id, use_msgpack)
+    heartbeat: asyncio.Task[None] = asyncio.create_task(_heartbeat(websocket, use_msgpack))
+
+    try:
+        await _send(websocket, use_msgpack, {
+            "type": "connected",
+            "message": "Подключен к системе алертов",
+            "user_id": user_id,
+            "timestamp": now_iso()
+        })
+
+        user_subscriptions = manager.get_user_subscriptions(user_id)
+        await _send(websocket, use_msgpack, {
+            "type": "user_stats",
+            "alerts_count": len(user_subscriptions),
+            "alert_ids": list(user_subscriptions.keys()),
+            "timestamp": now_iso()
+        })
+
+        while True:
+            try:
+                data: Union[str, bytes] = await _receive(websocket)
+                try:
+                    message: Dict[str, Any] = _parse_message(data)
+                except ValueError:
+                    await websocket.send_bytes(_BAD_JSON_FRAME.render(use_msgpack))
+                    continue
+                await handle_websocket_command(
+                    websocket, user_id, message, use_msgpack, manager, ws_manager
+                )
+
+            except WebSocketDisconnect:
+                break
+            except Exception as exc:
+                logger.exception(f"[WS] Ошибка обработки сообщения от {user_id}: {exc}")
+                # Частая причина ошибки - уже разорванный сокет: тогда и ответ
+                # не уйдет, выходим без второго стектрейса в логе
+                try:
+                    await websocket.send_bytes(_INTERNAL_ERROR_FRAME.render(use_msgpack))
+                except Exception:
+                    break
+
+    except WebSocketDisconnect:
+        logger.info(f"[WS] Пользователь {user_id} отключился")
+    except Exception as exc:
+        logger.exception(f"[WS] Критическая ошибка для пользователя {user_id}: {exc}")
+    finally:
+        heartbeat.cancel()
+        await ws_manager.disconnect(user_id, websocket)
+
+
+async def _handle_ping(
+    websocket: WebSocket,
+    user_id: int,
+    message: Dict[str, Any],
+    use_msgpack: bool,
+    manager: CompositeListenerManager,
+    ws_manager: WebSocketManager,
+) -> None:
+    """Отвечает pong на ping клиента."""
+    await websocket.send_bytes(_PONG_FRAME.render(use_msgpack))
+
+
+async def _handle_pong(
+    websocket: WebSocket,
+    user_id: int,
+    message: Dict[str, Any],
+    use_msgpack: bool,
+    manager: CompositeListenerManager,
+    ws_manager: WebSocketManager,
+) -> None:
+    """Принимает ответ клиента на серверный heartbeat, ничего не отправляет."""
+
+
+async def _handle_status(
+    websocket: WebSocket,
+    user_id: int,
+    message: Dict[str, Any],
+    use_msgpack: bool,
+    manager: CompositeListenerManager,
+    ws_manager: WebSocketManager,
+) -> None:
+    """Отправляет статистику системы и пользователя."""
+    user_subs = manager.get_user_subscriptions(user_id)
+    await _send(websocket, use_msgpack, {
+        "type": "status",
+        "connected_users": ws_manager.connected_count,
+        "your_alerts": len(user_subs),
+        "total_alerts": len(manager.all_alerts),
+        "timestamp": now_iso()
+    })
+
+
+async def _handle_my_alerts(
+    websocket: WebSocket,
+    user_id: int,
+    message: Dict[str, Any],
+    use_msgpack: bool,
+    manager: CompositeListenerManager,
+    ws_manager: WebSocketManager,
+) -> None:
+    """Отправляет список алертов пользователя.
+
+    Ключи элементов сокращены, как в кадрах /ws/densities: a - alert_id,
+    e - выражение, s - число подписчиков, c - cooldown. Клиент разворачивает
+    их обратно при получении.
+    """
+    user_subs = manager.get_user_subscriptions(user_id)
+    alerts_info: List[Dict[str, Any]] = [
+        {
+            "a": alert_id,
+            "e": listener.readable_expression,
+            "s": len(listener.subscribers),
+            "c": getattr(listener, "_cooldown", 0)
+        }
+        for alert_id, listener in user_subs.items()
+    ]
+
+    await _send(websocket, use_msgpack, {
+        "type": "my_alerts",
+        "alerts": alerts_info,
+        "timestamp": now_iso()
+    })
+
+
+async def _send_unknown(websocket: WebSocket, use_msgpack: bool, command_type: Any) -> None:
+    """Сообщает клиенту о неизвестной команде."""
+    await _send(websocket, use_msgpack, {
+        "type": "error",
+        "message": f"Неизвестная команда: {command_type}",
+        "timestamp": now_iso()
+    })
+
+
+# Таблица обработчиков команд: поиск по словарю вместо цепочки if/elif,
+# новая команда добавляется одной строкой.
+_COMMANDS: Dict[str, Callable[..., Awaitable[None]]] = {
+    "ping": _handle_ping,
+    "pong": _handle_pong,
+    "get_status": _handle_status,
+    "get_my_alerts": _handle_my_alerts,
+}
+
+
+async def handle_websocket_command(
+    websocket: WebSocket,
+    user_id: int,
+    message: Dict[str, Any],
+    use_msgpack: bool = False,
+    manager: Optional[CompositeListenerManager] = None,
+    ws_manager: Optional[WebSocketManager] = None,
+) -> None:
+    """Обрабатывает команды WebSocket от клиента.
+
+    Поддерживает следующие команды (см. _COMMANDS):
+    - ping: Отвечает pong для проверки соединения
+    - pong: Ответ клиента на серверный heartbeat, ничего не отправляет
+    - get_status: Возвращает статистику системы
+    - get_my_alerts: Возвращает список алертов пользователя
+
+    Args:
+        websocket: WebSocket соединение для отправки ответов.
+        user_id: Идентификатор пользователя.
+        message: Словарь с командой и параметрами.
+        use_msgpack: Отвечать бинарными кадрами MessagePack вместо JSON.
+        manager: Менеджер алертов, полученный один раз на соединение
+            (по умолчанию - CompositeListenerManager.instance()).
+        ws_manager: Менеджер WebSocket соединений, полученный один раз на
+            соединение (по умолчанию - WebSocketManager.instance()).
+
+    Note:
+        При неизвестной команде отправляет сообщение об ошибке.
+    """
+    command_type: Any = message.get("type")
+    handler = _COMMANDS.get(command_type) if isinstance(command_type, str) else None
+    if handler is None:
+        await _send_unknown(websocket, use_msgpack, command_type)
+        return
+    if manager is None:
+        manager = CompositeListenerManager.instance()
+    if ws_manager is None:
+        ws_manager = WebSocketManager.instance()
+    await handler(websocket, user_id, message, use_msgpack, manager, ws_manager)
@@ -0,0 +1,40 @@
+from typing import Any
+
+from uvicorn.protocols.websockets.websockets_impl import WebSocketProtocol
+from websockets.extensions.permessage_deflate import ServerPerMessageDeflateFactory
+
+# Окно LZ77 2^12 = 4 КБ вместо 32 КБ по умолчанию: кадры алертов маленькие,
+# а состояние zlib держится на каждое соединение все время его жизни
+DEFLATE_WINDOW_BITS = 12
+# memLevel 5 вместо 8: примерно в 8 раз меньше памяти на внутреннее
+# состояние компрессора при почти той же степени сжатия коротких кадров
+DEFLATE_MEM_LEVEL = 5
+
+
+class AlertsWebSocketProtocol(WebSocketProtocol):
+    """WebSocket протокол uvicorn с настроенным permessage-deflate.
+
+    Стандартная реализация uvicorn включает расширение с параметрами zlib
+    по умолчанию (окно 32 КБ, memLevel 8). Здесь окно и память компрессора
+    уменьшены, чтобы состояние сжатия на соединение оставалось небольшим
+    при большом числе подключенных пользователей. Контекст между кадрами
+    сохраняется: повторяющиеся ключи JSON сжимаются по словарю предыдущих
+    сообщений.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Инициализирует протокол и заменяет фабрику расширения сжатия.
+
+        Args:
+            *args: Позиционные аргументы WebSocketProtocol.
+            **kwargs: Именованные аргументы WebSocketProtocol.
+        """
+        super().__init__(*args, **kwargs)
+        if self.config.ws_per_message_deflate:
+            self.available_extensions = [
+                ServerPerMessageDeflateFactory(
+                    server_max_window_bits=DEFLATE_WINDOW_BITS,
+                    client_max_window_bits=DEFLATE_WINDOW_BITS,
+                    compress_settings={"memLevel": DEFLATE_MEM_LEVEL},
+                )
+            ]
@@ -6,6 +6,10 @@ BASE_DIR = Path(__file__).resolve().parent
 
 LOG_FILE = BASE_DIR / "debug.log"
 
+# Окно склейки алертов WebSocket в миллисекундах: все алерты, пришедшие
+# за это время, уходят пользователю одним кадром
+WS_BATCH_WINDOW_MS = int(os.getenv("WS_BATCH_WINDOW_MS", 30))
+
 class UnbufferedFileHandler(logging.FileHandler):
     """FileHandler без буферизации: каждый emit сразу пишется на диск.
     
@@ -7,12 +7,14 @@ import uvicorn
 from fastapi import FastAPI
 from contextlib import suppress, asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 
 from config import logger
 from api.alerts import router as alerts_router
 from api.ws import router as ws_router
+from api.ws_protocol import AlertsWebSocketProtocol
 from api.densities import router as densities_router
 from api.density_broadcaster import broadcaster
 from modules.price.price import main as price_main
@@ -56,7 +58,8 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title="Alerts API", 
     description="API для работы с алертами",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -67,6 +70,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Динамические ответы (JSON API) сжимаются на лету.
+# Статические ресурсы уже отдаются с готовым br/gzip и Content-Encoding,
+# такие ответы middleware пропускает без повторного сжатия.
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=6)
+
 app.include_router(alerts_router, tags=["alerts"])
 app.include_router(ws_router, prefix="/ws", tags=["websocket"])
 app.include_router(densities_router, tags=["densities"])
@@ -103,5 +111,10 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # Реализация websockets поддерживает permessage-deflate (RFC 7692):
+        # повторяющиеся ключи JSON в кадрах алертов хорошо сжимаются.
+        # AlertsWebSocketProtocol уменьшает окно и память zlib на соединение
+        ws=AlertsWebSocketProtocol,
+        ws_per_message_deflate=True
     )
\ No newline at end of file
@@ -9,6 +9,7 @@ from .plan import compile_plan, PlanFn
 from .registry import create_listener
 from modules.composite.utils import collect_conditions, ast_to_string
 from api.websocket_manager import WebSocketManager
+from api.ws_codec import now_iso
 
 TickerSet = Set[str]
 
@@ -145,15 +146,15 @@ class CompositeListener:
             "alert_id": self.id,
             "tickers": sorted(self._matched),
             "readable_expression": self.readable_expression,
-            "timestamp": dt.datetime.utcnow().isoformat(),
+            "timestamp": now_iso(),
             "cooldown": self._cooldown
         }
         
         logger.info(f"[ALERT] {self.id}: {alert_data['tickers']}")
         logger.debug(f"[SUBS] {sorted(self.subscribers)}")
         
-        sent_count = await WebSocketManager.instance().broadcast_alert(self.subscribers, alert_data)
-        logger.info(f"[WS SENT] {sent_count}/{len(self.subscribers)} подписчикам")
+        queued_count = await WebSocketManager.instance().broadcast_alert(self.subscribers, alert_data)
+        logger.info(f"[WS QUEUED] {queued_count}/{len(self.subscribers)} подписчикам")
 
     def add_subscriber(self, user_id: int) -> None:
         """
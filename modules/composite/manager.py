@@ -1,12 +1,17 @@
+import os
 import asyncio
 from asyncio import Semaphore
-from typing import Dict
+from typing import Dict, Tuple
 
 from config import logger
 from .ast_transform import Expr
 from .composite_listener import CompositeListener
 from .utils import ast_to_string
 
+# Сверка счётчика подписок полным пересчётом на каждом tick(): O(listeners),
+# поэтому включается только явно (COMPOSITE_CHECK_SUBSCRIBERS=1) для отладки
+CHECK_SUBSCRIBERS: bool = os.getenv("COMPOSITE_CHECK_SUBSCRIBERS") == "1"
+
 
 class CompositeListenerManager:
     """Singleton‑менеджер CompositeListener‑ов.
@@ -20,6 +25,10 @@ class CompositeListenerManager:
         _listeners: Словарь слушателей по ID условий.
         _current_semaphore_size: Текущий размер семафора.
         semaphore: Семафор для ограничения параллельности.
+        _version: Счётчик изменений подписок (растёт при любом subscribe/unsubscribe).
+        _subscriptions_cache: Кэш get_user_subscriptions: user_id -> (версия, подписки).
+        _total_subscribers: Суммарное число подписок по всем слушателям
+            (поддерживается инкрементально).
     """
 
     _instance: "CompositeListenerManager | None" = None
@@ -33,6 +42,9 @@ class CompositeListenerManager:
         self._listeners: Dict[str, CompositeListener] = {}
         self._current_semaphore_size = 50
         self.semaphore = Semaphore(self._current_semaphore_size)
+        self._version = 0
+        self._subscriptions_cache: Dict[int, Tuple[int, Dict[str, CompositeListener]]] = {}
+        self._total_subscribers = 0
 
     @classmethod
     def instance(cls) -> "CompositeListenerManager":
@@ -63,6 +75,11 @@ class CompositeListenerManager:
         expr_string = ast_to_string(expr)
         return str(hash(expr_string))
 
+    def _bump_version(self) -> None:
+        """Отмечает изменение подписок и сбрасывает кэш подписок пользователей."""
+        self._version += 1
+        self._subscriptions_cache.clear()
+
     def _update_semaphore_if_needed(self) -> None:
         """Обновляет размер семафора на основе текущего количества слушателей.
         
@@ -101,14 +118,14 @@ class CompositeListenerManager:
         condition_id = self._generate_condition_id(expr)
         
         if condition_id in self._listeners:
-            existing_listener = self._listeners[condition_id]
-            existing_listener.add_subscriber(user_id)
-            logger.info(f"[COMPOSITE] Подписка пользователя {user_id} на существующий слушатель {condition_id}")
-            return existing_listener
+            await self.subscribe(condition_id, user_id)
+            return self._listeners[condition_id]
         else:
             listener = CompositeListener(expr, user_id, condition_id)
             await listener.start()
             self._listeners[condition_id] = listener
+            self._total_subscribers += len(listener.subscribers)
+            self._bump_version()
             logger.info(f"[COMPOSITE] Создан новый слушатель {condition_id} для пользователя {user_id}")
             
             # Обновляем семафор после добавления нового слушателя
@@ -116,6 +133,31 @@ class CompositeListenerManager:
             
             return listener
         
+    async def subscribe(self, condition_id: str, user_id: int) -> bool:
+        """Подписывает пользователя на существующий слушатель.
+
+        Все изменения подписчиков идут через менеджер, чтобы сбрасывать
+        кэш get_user_subscriptions (см. _bump_version) и поддерживать
+        счётчик _total_subscribers.
+
+        Args:
+            condition_id: ID условия слушателя.
+            user_id: Telegram ID пользователя.
+
+        Returns:
+            bool: True если пользователь подписан, False если слушатель не найден
+                или пользователь уже подписан.
+        """
+        listener = self._listeners.get(condition_id)
+        if listener is None or user_id in listener.subscribers:
+            return False
+
+        listener.add_subscriber(user_id)
+        self._total_subscribers += 1
+        self._bump_version()
+        logger.info(f"[COMPOSITE] Подписка пользователя {user_id} на существующий слушатель {condition_id}")
+        return True
+
     async def remove_listener(self, condition_id: str) -> bool:
         """Удаляет слушатель по ID условия.
 
@@ -142,6 +184,8 @@ class CompositeListenerManager:
             logger.exception(f"[COMPOSITE] Ошибка при остановке композитного слушателя: {exc}")
         
         del self._listeners[condition_id]
+        self._total_subscribers -= len(listener.subscribers)
+        self._bump_version()
         logger.info(f"[COMPOSITE] Слушатель {condition_id} удалён")
         
         # Обновляем семафор после удаления слушателя
@@ -178,6 +222,8 @@ class CompositeListenerManager:
             return False
         
         listener.remove_subscriber(user_id)
+        self._total_subscribers -= 1
+        self._bump_version()
         logger.info(f"[COMPOSITE] Пользователь {user_id} отписан от слушателя {condition_id}")
         
         if not listener.subscribers:
@@ -207,6 +253,8 @@ class CompositeListenerManager:
         for condition_id, listener in self._listeners.items():
             if user_id in listener.subscribers:
                 listener.remove_subscriber(user_id)
+                self._total_subscribers -= 1
+                self._bump_version()
                 removed_count += 1
                 logger.info(f"[COMPOSITE] Пользователь {user_id} отписан от слушателя {condition_id}")
                 
@@ -228,6 +276,28 @@ class CompositeListenerManager:
         """
         return self._listeners
 
+    @property
+    def total_subscribers(self) -> int:
+        """Возвращает суммарное число подписок по всем алертам за O(1).
+
+        Returns:
+            int: Сумма len(listener.subscribers) по всем слушателям.
+        """
+        return self._total_subscribers
+
+    def _check_total_subscribers(self) -> None:
+        """Сверяет инкрементальный счётчик подписок с реальной суммой.
+
+        Вызывается из tick() только при включённом CHECK_SUBSCRIBERS:
+        расхождение логируется и исправляется.
+        """
+        actual = sum(len(listener.subscribers) for listener in self._listeners.values())
+        if actual != self._total_subscribers:
+            logger.warning(
+                f"[COMPOSITE] Счётчик подписок разошёлся: {self._total_subscribers} != {actual}"
+            )
+            self._total_subscribers = actual
+
     async def _process_listener_with_semaphore(
         self, listener_id: str, listener: CompositeListener
     ) -> None:
@@ -267,6 +337,9 @@ class CompositeListenerManager:
             Exception: Ошибки обработки отдельных слушателей логируются
                 в _process_listener_with_semaphore, но не прерывают общую обработку.
         """
+        if CHECK_SUBSCRIBERS:
+            self._check_total_subscribers()
+
         listeners_items = list(self._listeners.items())
         total_listeners = len(listeners_items)
         
@@ -322,7 +395,9 @@ class CompositeListenerManager:
         """Возвращает список слушателей, на которые подписан пользователь.
 
         Проходит по всем слушателям и возвращает те, в подписчиках
-        которых находится указанный пользователь.
+        которых находится указанный пользователь. Результат кэшируется до
+        следующего изменения подписок (см. _version), поэтому повторные
+        вызовы без изменений стоят O(1).
 
         Args:
             user_id: Telegram ID пользователя.
@@ -330,10 +405,16 @@ class CompositeListenerManager:
         Returns:
             Dict[str, CompositeListener]: Словарь с ID условий в качестве ключей
                 и соответствующими слушателями в качестве значений для всех
-                алертов пользователя.
+                алертов пользователя. Словарь общий для вызывающих - его нельзя
+                изменять.
         """
+        cached = self._subscriptions_cache.get(user_id)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
         subscriptions = {}
         for condition_id, listener in self._listeners.items():
             if user_id in listener.subscribers:
                 subscriptions[condition_id] = listener
+        self._subscriptions_cache[user_id] = (self._version, subscriptions)
         return subscriptions
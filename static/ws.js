@@ -0,0 +1,1395 @@
+let ws = null;
+let userId = null;
+let myAlerts = [];
+let triggeredToday = 0;
+let connectedUsers = 0;
+let alertBlacklists = {}; // alertId -> Set of blacklisted tickers
+
+// Modal Functions
+// Разметка справочника отдается отдельным сжатым ресурсом и
+// подгружается в простое браузера в инертный <template>: DOM
+// модального окна строится только при первом открытии.
+let helpModalPromise = null;
+let helpModalEl = null;
+
+function loadHelpModal() {
+    if (!helpModalPromise) {
+        helpModalPromise = fetch('/ws/help_modal.html')
+            .then(response => response.text())
+            .then(html => {
+                const tpl = document.createElement('template');
+                tpl.id = 'helpModalTpl';
+                tpl.innerHTML = html;
+                document.body.appendChild(tpl);
+                // Стили модала не входят в ws.css: подключаем их вместе с
+                // разметкой и ждем загрузки, чтобы модал не открылся без стилей
+                const link = tpl.content.querySelector('link[rel="stylesheet"]');
+                if (!link) return tpl;
+                return new Promise(resolve => {
+                    link.addEventListener('load', resolve, { once: true });
+                    link.addEventListener('error', resolve, { once: true });
+                    document.head.appendChild(link);
+                }).then(() => tpl);
+            })
+            .catch(error => {
+                helpModalPromise = null;
+                throw error;
+            });
+    }
+    return helpModalPromise;
+}
+
+function openHelpModal() {
+    loadHelpModal().then(tpl => {
+        if (!helpModalEl) {
+            helpModalEl = document.importNode(tpl.content.querySelector('#helpModal'), true);
+            helpModalEl.addEventListener('click', onHelpModalClick);
+            document.body.appendChild(helpModalEl);
+        }
+        // Двойной rAF: вставленный узел успевает получить стартовые стили,
+        // и переход opacity/transform отрабатывает уже при первом открытии
+        requestAnimationFrame(() => requestAnimationFrame(() => helpModalEl.classList.add('is-open')));
+    }).catch(() => showSystemMessage('Не удалось загрузить справочник', 'error'));
+}
+
+function closeHelpModal() {
+    if (!helpModalEl) return;
+    helpModalEl.classList.remove('is-open');
+}
+
+// Fallback для контекстов без Clipboard API (страница по http://)
+function copyWithExecCommand(text) {
+    const textarea = document.createElement('textarea');
+    textarea.value = text;
+    textarea.style.cssText = 'position:fixed;top:0;left:0;opacity:0';
+    document.body.appendChild(textarea);
+    textarea.select();
+    const ok = document.execCommand('copy');
+    textarea.remove();
+    if (!ok) throw new Error('execCommand copy failed');
+}
+
+async function copyToClipboardModal(text) {
+    try {
+        if (navigator.clipboard && window.isSecureContext) {
+            await navigator.clipboard.writeText(text);
+        } else {
+            copyWithExecCommand(text);
+        }
+        showSystemMessage('Скопировано: ' + text, 'success');
+    } catch (err) {
+        showSystemMessage('Ошибка копирования', 'error');
+    }
+}
+
+// Один делегированный обработчик на корне модального окна:
+// копирование примеров (текст берется из соседнего .ex)
+// и закрытие по клику на фон.
+function onHelpModalClick(event) {
+    const copyBtn = event.target.closest('.copy-btn-modal');
+    if (copyBtn) {
+        const code = copyBtn.parentElement.querySelector('.ex');
+        copyToClipboardModal(code.textContent.trim());
+    } else if (event.target === helpModalEl) {
+        closeHelpModal();
+    }
+}
+
+// Кнопки с data-action обслуживаются одним обработчиком на документе
+const actions = {
+    connect, disconnect, createAlert, openHelpModal, closeHelpModal,
+    loadMyAlerts, deleteAllAlerts, sendPing, getStatus
+};
+
+document.addEventListener('click', function(event) {
+    const target = event.target.closest('[data-action]');
+    if (target && actions[target.dataset.action]) {
+        actions[target.dataset.action]();
+    }
+});
+
+// Close modal with Escape key
+document.addEventListener('keydown', function(event) {
+    if (event.key === 'Escape') {
+        closeHelpModal();
+    }
+});
+
+// Load blacklists from localStorage
+// Каждый алерт хранится под своим ключом alertBlacklists:<id>, чтобы
+// правка одного блеклиста не пересериализовывала все остальные.
+const BLACKLIST_KEY_PREFIX = 'alertBlacklists:';
+const LEGACY_BLACKLIST_KEY = 'alertBlacklists';
+
+function loadBlacklists() {
+    alertBlacklists = {};
+    storedBlacklistJson.clear();
+    for (let i = 0; i < localStorage.length; i++) {
+        const key = localStorage.key(i);
+        if (!key.startsWith(BLACKLIST_KEY_PREFIX)) continue;
+        const alertId = key.slice(BLACKLIST_KEY_PREFIX.length);
+        const saved = localStorage.getItem(key);
+        try {
+            alertBlacklists[alertId] = new Set(JSON.parse(saved));
+            storedBlacklistJson.set(alertId, saved);
+        } catch (e) {
+            // Поврежденную запись пропускаем
+        }
+    }
+
+    // Перенос из старого формата: один объект со всеми алертами
+    const legacy = localStorage.getItem(LEGACY_BLACKLIST_KEY);
+    if (legacy) {
+        try {
+            for (const [alertId, tickers] of Object.entries(JSON.parse(legacy))) {
+                alertBlacklists[alertId] = new Set(tickers);
+                saveBlacklists(alertId);
+            }
+        } catch (e) {
+            // Старые данные нечитаемы - просто удаляем их
+        }
+        localStorage.removeItem(LEGACY_BLACKLIST_KEY);
+    }
+}
+
+// Save blacklists to localStorage
+// Записываются только измененные алерты и только в простое браузера
+// (requestIdleCallback): за один вызов тратится не больше
+// BLACKLIST_SAVE_BUDGET_MS, остаток переносится на следующий простой.
+// При закрытии вкладки несохраненное пишется сразу.
+const BLACKLIST_SAVE_DELAY_MS = 250;
+const BLACKLIST_SAVE_TIMEOUT_MS = 500;
+const BLACKLIST_SAVE_BUDGET_MS = 4;
+const dirtyBlacklists = new Set();
+const storedBlacklistJson = new Map(); // alertId -> последняя записанная строка
+let blacklistSaveHandle = null;
+
+function scheduleBlacklistPersist() {
+    if (blacklistSaveHandle !== null) return;
+    blacklistSaveHandle = window.requestIdleCallback
+        ? window.requestIdleCallback(() => persistBlacklists(BLACKLIST_SAVE_BUDGET_MS), { timeout: BLACKLIST_SAVE_TIMEOUT_MS })
+        : setTimeout(() => persistBlacklists(BLACKLIST_SAVE_BUDGET_MS), BLACKLIST_SAVE_DELAY_MS);
+}
+
+function saveBlacklists(alertId) {
+    dirtyBlacklists.add(String(alertId));
+    scheduleBlacklistPersist();
+}
+
+function persistBlacklists(budgetMs = Infinity) {
+    blacklistSaveHandle = null;
+    const start = performance.now();
+
+    for (const alertId of dirtyBlacklists) {
+        if (performance.now() - start > budgetMs) {
+            scheduleBlacklistPersist();
+            return;
+        }
+        dirtyBlacklists.delete(alertId);
+
+        const key = BLACKLIST_KEY_PREFIX + alertId;
+        const tickerSet = alertBlacklists[alertId];
+        if (!tickerSet || tickerSet.size === 0) {
+            if (storedBlacklistJson.delete(alertId)) localStorage.removeItem(key);
+            continue;
+        }
+        const json = JSON.stringify(Array.from(tickerSet));
+        if (json !== storedBlacklistJson.get(alertId)) {
+            localStorage.setItem(key, json);
+            storedBlacklistJson.set(alertId, json);
+        }
+    }
+}
+
+window.addEventListener('beforeunload', function() {
+    if (dirtyBlacklists.size > 0) persistBlacklists();
+});
+
+// WebSocket Management
+// Переподключение с экспоненциальной задержкой и джиттером: соединение
+// восстанавливается само, без повторного нажатия "Подключиться".
+// Не переподключаемся после закрытия со своей стороны (disconnect() или
+// замена сокета в connect()) и после штатного закрытия с кодом 1000:
+// так сервер закрывает старый сокет пользователя, открывшего новую вкладку.
+const RECONNECT_BASE_MS = 500;
+const RECONNECT_MAX_MS = 30000;
+let retryMs = RECONNECT_BASE_MS;
+let reconnectTimer = null;
+
+function connect() {
+    clearTimeout(reconnectTimer);
+    reconnectTimer = null;
+    userId = document.getElementById('userId').value;
+    if (!userId) {
+        alert('Введите User ID');
+        return;
+    }
+
+    if (ws) {
+        closeByClient(ws);
+    }
+
+    // Request notification permission
+    if (Notification.permission === 'default') {
+        Notification.requestPermission();
+    }
+
+    // Бинарный MessagePack, если декодер (msgpack.js) загрузился; иначе JSON
+    const format = window.MessagePack ? 'msgpack' : 'json';
+    const socket = new WebSocket(`ws://${window.location.host}/ws/alerts/${userId}?format=${format}`);
+    socket.binaryType = 'arraybuffer';
+    ws = socket;
+    
+    ws.onopen = function() {
+        retryMs = RECONNECT_BASE_MS;
+        updateConnectionStatus(true);
+        showSystemMessage('Подключено к WebSocket', 'success');
+        loadMyAlerts();
+    };
+
+    ws.onmessage = function(event) {
+        queueWebSocketMessage(decodeFrame(event.data));
+    };
+
+    ws.onclose = function(event) {
+        if (ws === socket) {
+            ws = null;
+        }
+        // Сокет уже заменен новым connect(): статусом управляет новый сокет
+        if (ws !== null) return;
+        updateConnectionStatus(false);
+        showSystemMessage('Отключено от WebSocket', 'error');
+        if (socket.closedByClient || event.code === 1000) return;
+        reconnectTimer = setTimeout(connect, retryMs + Math.random() * 200);
+        retryMs = Math.min(retryMs * 2, RECONNECT_MAX_MS);
+    };
+
+    ws.onerror = function(error) {
+        showSystemMessage('WebSocket error: ' + error, 'error');
+    };
+}
+
+function closeByClient(socket) {
+    socket.closedByClient = true;
+    socket.close();
+}
+
+function disconnect() {
+    clearTimeout(reconnectTimer);
+    reconnectTimer = null;
+    if (ws) {
+        closeByClient(ws);
+        ws = null;
+    }
+}
+
+// Сервер шлет JSON (orjson) и MessagePack бинарными кадрами; JSON
+// узнается по первому байту '{' или '[' (карта MessagePack так не начинается)
+const utf8Decoder = new TextDecoder();
+
+function decodeFrame(frame) {
+    if (typeof frame === 'string') {
+        return JSON.parse(frame);
+    }
+    const bytes = new Uint8Array(frame);
+    if (bytes[0] === 0x7b || bytes[0] === 0x5b) {
+        return JSON.parse(utf8Decoder.decode(bytes));
+    }
+    return MessagePack.decode(bytes);
+}
+
+function updateConnectionStatus(connected) {
+    const statusEl = document.getElementById('status');
+    if (connected) {
+        statusEl.textContent = 'Подключено';
+        statusEl.className = 'status-indicator connected';
+    } else {
+        statusEl.textContent = 'Отключено';
+        statusEl.className = 'status-indicator disconnected';
+    }
+}
+
+// WebSocket Message Handling
+// Входящие сообщения копятся и разбираются пачкой раз в кадр: подсветка
+// карточек схлопывается по alert_id, счетчик обновляется один раз.
+// В фоновой вкладке rAF не вызывается, поэтому там используется таймер,
+// чтобы уведомления не задерживались.
+//
+// Сервер может склеивать несколько событий в один кадр-конверт
+// {type: 'batch', items: [...]} (до 128 событий): один парсинг кадра на
+// пачку, элементы разбираются так же, как одиночные сообщения.
+const pendingMessages = [];
+let messagesFlushScheduled = false;
+
+function queueWebSocketMessage(data) {
+    if (data.type === 'batch') {
+        for (const item of data.items) {
+            pendingMessages.push(item);
+        }
+    } else {
+        pendingMessages.push(data);
+    }
+    if (messagesFlushScheduled) return;
+    messagesFlushScheduled = true;
+    if (document.hidden) {
+        setTimeout(flushPendingMessages, 100);
+    } else {
+        requestAnimationFrame(flushPendingMessages);
+    }
+}
+
+function flushPendingMessages() {
+    messagesFlushScheduled = false;
+    const batch = { highlighted: new Set(), triggered: 0 };
+
+    for (const data of pendingMessages.splice(0)) {
+        handleWebSocketMessage(data, batch);
+    }
+
+    for (const alertId of batch.highlighted) {
+        highlightAlertCard(alertId);
+    }
+    if (batch.triggered) {
+        triggeredToday += batch.triggered;
+        updateTriggeredCount();
+    }
+
+    // Все строки пачки уже в истории: рисуем окно одной вставкой фрагмента
+    // в этом же кадре, а не отдельным rAF в следующем
+    if (triggeredRafId !== null && !document.hidden) {
+        cancelAnimationFrame(triggeredRafId);
+        triggeredRafId = null;
+        renderTriggeredWindow();
+    }
+}
+
+function handleWebSocketMessage(data, batch) {
+    switch(data.type) {
+        case 'alert':
+            handleAlertTriggered(data, batch);
+            break;
+        case 'alert_created':
+            showSystemMessage('Алерт создан: ' + data.expression, 'success');
+            upsertMyAlert(data);
+            break;
+        case 'alert_deleted':
+            showSystemMessage('Алерт удален', 'success');
+            removeMyAlert(data.alert_id);
+            break;
+        case 'all_alerts_deleted':
+            showSystemMessage('Алерт удален', 'success');
+            renderMyAlerts([]);
+            break;
+        case 'my_alerts':
+            renderMyAlerts(data.alerts.map(expandMyAlert));
+            break;
+        case 'status':
+            updateStats(data);
+            break;
+        case 'connected':
+            showSystemMessage('Подключен к системе алертов', 'success');
+            break;
+        case 'user_stats':
+            updateActiveAlertsCount(data.alerts_count);
+            break;
+        case 'ping':
+            // Heartbeat сервера: отвечаем молча
+            if (ws && ws.readyState === WebSocket.OPEN) {
+                ws.send(JSON.stringify({type: 'pong'}));
+            }
+            break;
+        case 'pong':
+            flashStatusDot();
+            break;
+        default:
+            console.log('Unknown message type:', data);
+    }
+}
+
+function handleAlertTriggered(data, batch) {
+    // Filter tickers based on blacklist
+    const filteredData = filterAlertByBlacklist(data);
+    
+    // Only show alert if there are tickers left after filtering
+    if (filteredData.tickers && filteredData.tickers.length > 0) {
+        // Add to triggered alerts
+        addTriggeredAlert(filteredData);
+        
+        // Highlight and counter are applied once per batch
+        batch.highlighted.add(data.alert_id);
+        batch.triggered++;
+        
+        // Show browser notification
+        if (Notification.permission === 'granted') {
+            new Notification('🚨 Алерт сработал!', {
+                body: `${filteredData.tickers.join(', ')}: ${data.readable_expression}`,
+                icon: '🚨'
+            });
+        }
+    } else {
+        // All tickers were filtered out
+        console.log('Alert filtered out completely:', data.alert_id);
+        addFilteredAlert(data);
+    }
+}
+
+function filterAlertByBlacklist(alertData) {
+    const alertId = alertData.alert_id;
+    const blacklist = alertBlacklists[alertId] || new Set();
+    
+    if (!alertData.tickers || blacklist.size === 0) {
+        return alertData;
+    }
+
+    // Один проход с разбиением на оставленные и отброшенные тикеры;
+    // сравниваем в uppercase для корректной фильтрации
+    const kept = [];
+    const dropped = [];
+    for (const ticker of alertData.tickers) {
+        (blacklist.has(ticker.toUpperCase()) ? dropped : kept).push(ticker);
+    }
+    
+    return {
+        ...alertData,
+        tickers: kept,
+        filtered: dropped.length > 0,
+        originalTickers: alertData.tickers,
+        filteredOutTickers: dropped
+    };
+}
+
+// Triggered alerts: виртуальный список поверх ограниченной истории.
+// В DOM живут только строки, попадающие в окно прокрутки.
+const TRIGGERED_ROW_HEIGHT = 260;
+// Сколько бейджей тикеров помещается в два ряда строки; остальные
+// показываются одним бейджем "+N" со списком в title
+const TRIGGERED_MAX_BADGES = 10;
+const TRIGGERED_HISTORY_LIMIT = 500;
+let triggeredView = null;
+let triggeredRafId = null;
+
+// Кольцевой буфер истории: запись нового элемента и вытеснение самого
+// старого - O(1), без сдвига массива, как у unshift/pop.
+const triggeredHistory = {
+    buffer: new Array(TRIGGERED_HISTORY_LIMIT),
+    head: 0,   // индекс самой новой записи
+    length: 0,
+    version: 0,   // растет на каждую запись: окно знает, что данные сдвинулись
+
+    push(entry) {
+        this.version++;
+        this.head = (this.head + 1) % TRIGGERED_HISTORY_LIMIT;
+        this.buffer[this.head] = entry;
+        if (this.length < TRIGGERED_HISTORY_LIMIT) this.length++;
+    },
+
+    // i = 0 - самая новая запись
+    at(i) {
+        return this.buffer[(this.head - i + TRIGGERED_HISTORY_LIMIT) % TRIGGERED_HISTORY_LIMIT];
+    }
+};
+
+function initTriggeredView() {
+    const container = document.getElementById('triggeredAlerts');
+    triggeredView = {
+        container,
+        empty: document.getElementById('triggeredEmpty'),
+        spacer: container.querySelector('.tv-spacer'),
+        win: container.querySelector('.tv-window'),
+        // Последнее отрисованное окно: прокрутка внутри той же строки
+        // и без новых записей не пересобирает DOM
+        start: -1,
+        end: -1,
+        version: -1,
+        // Геометрия контейнера читается в обработчиках scroll/resize, а не
+        // при отрисовке: renderTriggeredWindow вызывается и после других
+        // записей в DOM в том же кадре, и чтение там форсировало бы layout
+        scrollTop: container.scrollTop,
+        viewportHeight: container.clientHeight || 400
+    };
+    container.addEventListener('scroll', onTriggeredScroll, { passive: true });
+    if (window.ResizeObserver) {
+        new ResizeObserver(entries => {
+            triggeredView.viewportHeight = entries[0].contentRect.height || 400;
+            scheduleTriggeredRender();
+        }).observe(container);
+    }
+}
+
+function onTriggeredScroll() {
+    triggeredView.scrollTop = triggeredView.container.scrollTop;
+    scheduleTriggeredRender();
+}
+
+// Пачка алертов (и событий прокрутки) за один кадр дает одну перерисовку
+function scheduleTriggeredRender() {
+    if (triggeredRafId === null) {
+        triggeredRafId = requestAnimationFrame(() => {
+            triggeredRafId = null;
+            renderTriggeredWindow();
+        });
+    }
+}
+
+// Одна и та же строка выражения на alert_id: повторные срабатывания
+// одного алерта не держат в истории сотни одинаковых копий
+const exprTextCache = new Map();
+
+function internExpression(alertId, expression) {
+    const cached = exprTextCache.get(alertId);
+    if (cached === expression) return cached;
+    exprTextCache.set(alertId, expression);
+    return expression;
+}
+
+function pushTriggeredEntry(entry) {
+    entry.data.readable_expression = internExpression(entry.data.alert_id, entry.data.readable_expression);
+    triggeredHistory.push(entry);
+    scheduleTriggeredRender();
+}
+
+function renderTriggeredWindow() {
+    if (!triggeredView) initTriggeredView();
+    const { empty, spacer, win, scrollTop, viewportHeight } = triggeredView;
+    const total = triggeredHistory.length;
+
+    // Только вычисления по закэшированной геометрии, дальше - только запись
+    const start = Math.floor(scrollTop / TRIGGERED_ROW_HEIGHT);
+    const visible = Math.ceil(viewportHeight / TRIGGERED_ROW_HEIGHT) + 2;
+    const end = Math.min(total, start + visible);
+
+    if (start === triggeredView.start && end === triggeredView.end
+            && triggeredHistory.version === triggeredView.version) {
+        return;
+    }
+    triggeredView.start = start;
+    triggeredView.end = end;
+    triggeredView.version = triggeredHistory.version;
+
+    empty.style.display = total ? 'none' : '';
+    spacer.style.height = total * TRIGGERED_ROW_HEIGHT + 'px';
+
+    win.style.transform = `translateY(${start * TRIGGERED_ROW_HEIGHT}px)`;
+    const fragment = document.createDocumentFragment();
+    for (let i = start; i < end; i++) {
+        fragment.appendChild(renderTriggeredRow(triggeredHistory.at(i)));
+    }
+    win.replaceChildren(fragment);
+}
+
+// Строка собирается клонированием <template id="triggeredAlertTpl">,
+// данные пишутся через textContent (без HTML-парсера и без инъекций
+// разметки из readable_expression/тикеров)
+let instantiateTriggeredRow = null;
+
+function renderTriggeredRow(entry) {
+    if (!instantiateTriggeredRow) {
+        instantiateTriggeredRow = compileTemplate(document.getElementById('triggeredAlertTpl'), {
+            title: '.t-title',
+            time: '.t-time',
+            expr: '.t-expr',
+            tickers: '.t-tickers',
+            filtered: '.t-filtered',
+            id: '.t-id'
+        });
+    }
+    const data = entry.data;
+    const { el: alertEl, refs } = instantiateTriggeredRow();
+    const filteredInfo = refs.filtered;
+    const tickers = data.tickers || [];
+
+    refs.time.textContent = new Date(data.timestamp).toLocaleTimeString();
+    refs.expr.textContent = data.readable_expression;
+    refs.expr.title = data.readable_expression;
+    refs.id.textContent = `ID: ${data.alert_id}`;
+
+    const badgeClass = entry.allFiltered ? 'ticker-badge filtered' : 'ticker-badge';
+    // Бейджи собираются во фрагменте и вставляются одной операцией,
+    // без промежуточной HTML-строки и повторного парсинга
+    const badges = document.createDocumentFragment();
+    const shown = tickers.length > TRIGGERED_MAX_BADGES ? TRIGGERED_MAX_BADGES - 1 : tickers.length;
+    for (let i = 0; i < shown; i++) {
+        const badge = document.createElement('span');
+        badge.className = badgeClass;
+        badge.textContent = tickers[i];
+        badges.appendChild(badge);
+    }
+    if (shown < tickers.length) {
+        const more = document.createElement('span');
+        more.className = 'ticker-badge ticker-more';
+        more.textContent = `+${tickers.length - shown}`;
+        more.title = tickers.slice(shown).join(', ');
+        badges.appendChild(more);
+        refs.tickers.title = tickers.join(', ');
+    }
+    refs.tickers.replaceChildren(badges);
+
+    if (entry.allFiltered) {
+        alertEl.classList.add('filtered');
+        refs.title.textContent = '⚠️ АЛЕРТ ОТФИЛЬТРОВАН';
+        filteredInfo.textContent = `🚫 Все тикеры (${tickers.length}) находятся в блеклисте для этого алерта`;
+        filteredInfo.title = filteredInfo.textContent;
+    } else {
+        refs.title.textContent = '🚨 АЛЕРТ СРАБОТАЛ!';
+        if (data.filtered) {
+            filteredInfo.textContent = `ℹ️ Блеклист: ${data.filteredOutTickers.join(', ')}`;
+            filteredInfo.title = filteredInfo.textContent;
+        } else {
+            filteredInfo.remove();
+        }
+    }
+
+    // Анимация появления только для только что пришедшей строки
+    if (entry.isNew) {
+        alertEl.classList.add('is-new');
+        alertEl.addEventListener('animationend', () => alertEl.classList.remove('is-new'), { once: true });
+        entry.isNew = false;
+    }
+    return alertEl;
+}
+
+function addTriggeredAlert(data) {
+    pushTriggeredEntry({ data, allFiltered: false, isNew: true });
+}
+
+function addFilteredAlert(data) {
+    pushTriggeredEntry({ data, allFiltered: true, isNew: true });
+}
+
+function highlightAlertCard(alertId) {
+    const card = cardNodes.get(alertId);
+    if (card) {
+        applyHighlight(card, ALERT_HIGHLIGHT_MS);
+    } else if (alertsById.has(alertId)) {
+        // Карточка сейчас вне окна: подсветим при материализации
+        pendingHighlights.set(alertId, Date.now() + ALERT_HIGHLIGHT_MS);
+    }
+}
+
+// Повторное срабатывание в пределах подсветки продлевает ее,
+// а не плодит параллельные таймеры
+const highlightTimers = new WeakMap();
+
+function applyHighlight(card, duration) {
+    card.classList.add('triggered');
+    clearTimeout(highlightTimers.get(card));
+    highlightTimers.set(card, setTimeout(() => {
+        card.classList.remove('triggered');
+        highlightTimers.delete(card);
+    }, duration));
+}
+
+// Blacklist Management
+function addToBlacklist(alertId, ticker) {
+    ticker = ticker.trim().toUpperCase();
+    if (!ticker) return;
+
+    if (!alertBlacklists[alertId]) {
+        alertBlacklists[alertId] = new Set();
+    }
+    
+    alertBlacklists[alertId].add(ticker);
+    blacklistTextCache.delete(alertId);
+    saveBlacklists(alertId);
+    updateBlacklistDisplay(alertId);
+    showSystemMessage(`Тикер ${ticker} добавлен в блеклист`, 'info');
+}
+
+function removeFromBlacklist(alertId, ticker) {
+    if (alertBlacklists[alertId]) {
+        alertBlacklists[alertId].delete(ticker);
+        if (alertBlacklists[alertId].size === 0) {
+            delete alertBlacklists[alertId];
+        }
+        blacklistTextCache.delete(alertId);
+        saveBlacklists(alertId);
+        updateBlacklistDisplay(alertId);
+        showSystemMessage(`Тикер ${ticker} удален из блеклиста`, 'info');
+    }
+}
+
+// Готовые подписи блеклиста по alertId: карточки перерисовываются часто,
+// а блеклисты меняются редко, поэтому строки собираются один раз и
+// сбрасываются только при изменении блеклиста.
+const blacklistTextCache = new Map();
+
+function getBlacklistText(alertId) {
+    let view = blacklistTextCache.get(alertId);
+    if (!view) {
+        const blacklist = alertBlacklists[alertId];
+        const size = blacklist ? blacklist.size : 0;
+        view = {
+            size,
+            countText: size > 0 ? `${size} тикеров` : 'пусто',
+            summary: size > 0 ? `🚫 Блеклист: ${Array.from(blacklist).join(', ')}` : ''
+        };
+        blacklistTextCache.set(alertId, view);
+    }
+    return view;
+}
+
+function updateBlacklistDisplay(alertId) {
+    const card = cardNodes.get(alertId);
+    if (!card) return;
+    renderBlacklistInto(cardRefs.get(card), alertId);
+}
+
+function renderBlacklistInto(refs, alertId) {
+    const blacklist = alertBlacklists[alertId];
+    const view = getBlacklistText(alertId);
+    
+    // Update count
+    refs.blacklistCount.textContent = view.countText;
+    
+    // Update tags
+    if (view.size === 0) {
+        refs.blacklistTags.innerHTML = '<span style="color: #606060; font-size: 11px;">Нет заблокированных тикеров</span>';
+    } else {
+        // Кнопки удаления без inline onclick: клик ловит делегированный
+        // обработчик на #alertsGrid, тикер берется из data-ticker
+        const frag = document.createDocumentFragment();
+        for (const ticker of blacklist) {
+            const tag = document.createElement('span');
+            tag.className = 'blacklist-tag';
+            tag.textContent = ticker;
+            const remove = document.createElement('span');
+            remove.className = 'remove-btn';
+            remove.dataset.ticker = ticker;
+            remove.textContent = '\u00d7';
+            tag.appendChild(remove);
+            frag.appendChild(tag);
+        }
+        refs.blacklistTags.replaceChildren(frag);
+    }
+}
+
+// Alert Management
+async function createAlert() {
+    const expression = document.getElementById('alertExpression').value.trim();
+    if (!expression) {
+        alert('Введите выражение алерта');
+        return;
+    }
+
+    if (!userId) {
+        alert('Сначала подключитесь');
+        return;
+    }
+
+    try {
+        const response = await fetch('/alerts', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                expression: expression,
+                user_id: userId
+            })
+        });
+
+        const result = await response.json();
+        
+        if (response.ok) {
+            showSystemMessage('Алерт создан: ' + result.expression, 'success');
+            document.getElementById('alertExpression').value = '';
+            upsertMyAlert(result);
+        } else {
+            showSystemMessage('Ошибка: ' + result.detail, 'error');
+        }
+    } catch (error) {
+        showSystemMessage('Ошибка создания алерта: ' + error.message, 'error');
+    }
+}
+
+async function loadMyAlerts() {
+    if (!userId) return;
+
+    // При открытом соединении список приходит кадром my_alerts с короткими
+    // ключами, без отдельного HTTP запроса
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({type: 'get_my_alerts'}));
+        return;
+    }
+
+    try {
+        const response = await fetch(`/alerts?user_id=${userId}`);
+        renderMyAlerts(await response.json());
+    } catch (error) {
+        showSystemMessage('Ошибка загрузки алертов: ' + error.message, 'error');
+    }
+}
+
+function debounce(fn, delay) {
+    let timer = null;
+    return function(...args) {
+        clearTimeout(timer);
+        timer = setTimeout(() => {
+            timer = null;
+            fn.apply(this, args);
+        }, delay);
+    };
+}
+
+// Серия событий (массовое создание/удаление) схлопывается в один запрос
+const scheduleLoadMyAlerts = debounce(loadMyAlerts, 150);
+
+// Сетка активных алертов - основное представление. Компактный список
+// дублирует те же данные, поэтому строится только когда его панель
+// раскрыта; в свернутом виде помечается устаревшим и догоняет при открытии.
+let myAlertsListStale = false;
+
+function renderMyAlerts(alerts) {
+    myAlerts = alerts;
+    if (document.getElementById('myAlertsPanel').open) {
+        displayMyAlerts(alerts);
+    } else {
+        myAlertsListStale = true;
+    }
+    displayAlertsGrid(alerts);
+    updateActiveAlertsCount(alerts.length);
+}
+
+function onMyAlertsPanelToggle(event) {
+    if (event.target.open && myAlertsListStale) {
+        myAlertsListStale = false;
+        displayMyAlerts(myAlerts);
+    }
+}
+
+// Локальные изменения списка по данным из события или ответа API:
+// сетевой запрос нужен только если в событии не хватает полей
+function upsertMyAlert(alert) {
+    if (alert.subscribers_count === undefined) {
+        scheduleLoadMyAlerts();
+        return;
+    }
+    const entry = {
+        alert_id: alert.alert_id,
+        expression: alert.expression,
+        subscribers_count: alert.subscribers_count,
+        is_websocket_connected: alert.is_websocket_connected
+    };
+    const index = myAlerts.findIndex(item => item.alert_id === entry.alert_id);
+    const next = myAlerts.slice();
+    if (index === -1) {
+        next.push(entry);
+    } else {
+        next[index] = entry;
+    }
+    renderMyAlerts(next);
+}
+
+// Элемент кадра my_alerts: a - id, e - выражение, s - подписчики
+function expandMyAlert(item) {
+    return {
+        alert_id: item.a,
+        expression: item.e,
+        subscribers_count: item.s,
+        is_websocket_connected: true
+    };
+}
+
+function removeMyAlert(alertId) {
+    const next = myAlerts.filter(item => item.alert_id !== alertId);
+    if (next.length !== myAlerts.length) {
+        renderMyAlerts(next);
+    }
+}
+
+// Карточки строятся клонированием <template> и хранятся по alert_id:
+// при повторной загрузке списка переиспользуются существующие узлы,
+// а меняются только изменившиеся поля.
+function createTemplate(html) {
+    const template = document.createElement('template');
+    template.innerHTML = html.trim();
+    return template;
+}
+
+// Путь к узлу от корня шаблона в виде индексов children
+function nodePath(root, node) {
+    const path = [];
+    while (node !== root) {
+        path.unshift(Array.prototype.indexOf.call(node.parentElement.children, node));
+        node = node.parentElement;
+    }
+    return path;
+}
+
+// "Компилирует" шаблон: селекторы динамических слотов разрешаются один раз
+// в пути по индексам children, и построитель на каждый клон проходит по
+// готовым индексам вместо querySelector.
+// source - HTML-строка или готовый <template>; slots - {имя: селектор}.
+function compileTemplate(source, slots) {
+    const template = typeof source === 'string' ? createTemplate(source) : source;
+    const root = template.content.firstElementChild;
+    const paths = Object.entries(slots).map(([name, selector]) => [name, nodePath(root, root.querySelector(selector))]);
+
+    return function instantiate() {
+        const el = root.cloneNode(true);
+        const refs = {};
+        for (const [name, path] of paths) {
+            let node = el;
+            for (const index of path) node = node.children[index];
+            refs[name] = node;
+        }
+        return { el, refs };
+    };
+}
+
+const instantiateMyAlert = compileTemplate(`
+    <div class="card alert-card" style="margin-bottom: 10px; padding: 15px;">
+        <div class="alert-id"></div>
+        <div class="alert-expression"></div>
+        <div class="alert-stats">
+            <span class="alert-subscribers"></span>
+            <span class="alert-connection"></span>
+        </div>
+        <div class="alert-blacklist" style="font-size: 11px; color: #808080; margin: 5px 0;"></div>
+        <button class="btn-danger" style="width: 100%; margin-top: 10px;">Удалить</button>
+    </div>
+`, {
+    id: '.alert-id',
+    expression: '.alert-expression',
+    subscribers: '.alert-subscribers',
+    connection: '.alert-connection',
+    blacklist: '.alert-blacklist',
+    deleteBtn: 'button'
+});
+
+const myAlertNodes = new Map();  // alertId -> {card, refs}
+
+function buildMyAlertItem(alert) {
+    const { el: card, refs } = instantiateMyAlert();
+    refs.id.textContent = alert.alert_id;
+    refs.expression.textContent = alert.expression;
+    refs.deleteBtn.onclick = () => deleteAlert(alert.alert_id);
+    patchMyAlertItem(refs, alert);
+    return { card, refs };
+}
+
+function patchMyAlertItem(refs, alert) {
+    const view = getBlacklistText(alert.alert_id);
+    setText(refs.subscribers, `Подписчиков: ${alert.subscribers_count}`);
+    setText(refs.connection, alert.is_websocket_connected ? '🟢' : '🔴');
+    setText(refs.blacklist, view.summary);
+    refs.blacklist.hidden = view.size === 0;
+}
+
+function setText(node, text) {
+    if (node.textContent !== text) node.textContent = text;
+}
+
+// Приводит детей контейнера к порядку nodes, перемещая только узлы не на месте
+function reconcileChildren(container, nodes) {
+    let cursor = container.firstElementChild;
+    for (const node of nodes) {
+        if (node === cursor) {
+            cursor = cursor.nextElementSibling;
+        } else {
+            container.insertBefore(node, cursor);
+        }
+    }
+    while (cursor) {
+        const next = cursor.nextElementSibling;
+        cursor.remove();
+        cursor = next;
+    }
+}
+
+function displayMyAlerts(alerts) {
+    const container = document.getElementById('myAlertsList');
+    const ids = new Set(alerts.map(alert => alert.alert_id));
+
+    for (const alertId of myAlertNodes.keys()) {
+        if (!ids.has(alertId)) myAlertNodes.delete(alertId);
+    }
+
+    if (alerts.length === 0) {
+        container.innerHTML = '<div class="no-alerts">Нет активных алертов</div>';
+        return;
+    }
+
+    const nodes = alerts.map(alert => {
+        let item = myAlertNodes.get(alert.alert_id);
+        if (item) {
+            patchMyAlertItem(item.refs, alert);
+        } else {
+            item = buildMyAlertItem(alert);
+            myAlertNodes.set(alert.alert_id, item);
+        }
+        return item.card;
+    });
+    reconcileChildren(container, nodes);
+}
+
+// Active alerts grid: виртуализация через IntersectionObserver.
+// Каждый алерт представлен легким слотом фиксированной высоты; полная
+// карточка строится, только когда слот подходит к области видимости,
+// и выгружается обратно, когда уходит из нее.
+const ALERT_SLOT_HEIGHT = 340;
+const ALERT_HIGHLIGHT_MS = 3000;
+let alertsById = new Map();
+const slotNodes = new Map();          // alertId -> .alert-slot
+const cardNodes = new Map();          // alertId -> материализованная .alert-card
+const cardRefs = new WeakMap();       // .alert-card -> ссылки на изменяемые узлы
+const pendingHighlights = new Map();  // alertId -> момент окончания подсветки
+let alertSlotObserver = null;
+
+function getAlertSlotObserver() {
+    if (!alertSlotObserver) {
+        alertSlotObserver = new IntersectionObserver(onAlertSlotsIntersect, {
+            root: document.getElementById('alertsGrid'),
+            rootMargin: '400px'
+        });
+    }
+    return alertSlotObserver;
+}
+
+function onAlertSlotsIntersect(entries) {
+    for (const entry of entries) {
+        if (entry.isIntersecting) {
+            materializeAlertSlot(entry.target);
+        } else {
+            dematerializeAlertSlot(entry.target, entry.boundingClientRect.height);
+        }
+    }
+}
+
+function materializeAlertSlot(slot) {
+    const alertId = slot.dataset.alertId;
+    const alert = alertsById.get(alertId);
+    if (!alert || cardNodes.has(alertId)) return;
+
+    const card = buildAlertCard(alert);
+    slot.replaceChildren(card);
+    slot.style.height = '';
+    cardNodes.set(alertId, card);
+
+    const highlightUntil = pendingHighlights.get(alertId);
+    if (highlightUntil) {
+        pendingHighlights.delete(alertId);
+        const remaining = highlightUntil - Date.now();
+        if (remaining > 0) applyHighlight(card, remaining);
+    }
+}
+
+function dematerializeAlertSlot(slot, height) {
+    const alertId = slot.dataset.alertId;
+    if (!cardNodes.has(alertId)) return;
+    // Не выгружаем карточку, в поле блеклиста которой сейчас фокус
+    if (slot.contains(document.activeElement)) return;
+
+    slot.style.height = (height || ALERT_SLOT_HEIGHT) + 'px';
+    slot.replaceChildren();
+    cardNodes.delete(alertId);
+}
+
+const instantiateAlertCard = compileTemplate(`
+    <div class="card alert-card">
+        <div class="alert-header">
+            <h4>Алерт</h4>
+            <div class="alert-id"></div>
+        </div>
+        <div class="alert-expression"></div>
+        <div class="alert-stats">
+            <span class="alert-subscribers"></span>
+            <span class="alert-connection"></span>
+        </div>
+        
+        <div class="blacklist-section">
+            <div class="blacklist-header">
+                <span class="blacklist-title">🚫 Блеклист тикеров</span>
+                <span class="blacklist-count"></span>
+            </div>
+            <div class="blacklist-tags"></div>
+            <div class="blacklist-input-row">
+                <input type="text" class="blacklist-input" placeholder="BTC" autocomplete="off" autocorrect="off" spellcheck="false">
+                <button class="add-blacklist-btn">+</button>
+            </div>
+        </div>
+        
+        <div class="alert-actions">
+            <button class="btn-danger">🗑️ Удалить</button>
+        </div>
+    </div>
+`, {
+    id: '.alert-id',
+    expression: '.alert-expression',
+    subscribers: '.alert-subscribers',
+    connection: '.alert-connection',
+    blacklistCount: '.blacklist-count',
+    blacklistTags: '.blacklist-tags'
+});
+
+function buildAlertCard(alert) {
+    const alertId = alert.alert_id;
+    const { el: card, refs } = instantiateAlertCard();
+    cardRefs.set(card, refs);
+
+    card.dataset.alertId = alertId;
+    refs.id.textContent = alertId;
+    refs.expression.textContent = alert.expression;
+
+    patchAlertCard(refs, alert);
+    renderBlacklistInto(refs, alertId);
+    return card;
+}
+
+function patchAlertCard(refs, alert) {
+    setText(refs.subscribers, `👥 ${alert.subscribers_count}`);
+    setText(refs.connection, alert.is_websocket_connected ? '🟢 Подключен' : '🔴 Отключен');
+}
+
+function displayAlertsGrid(alerts) {
+    const container = document.getElementById('alertsGrid');
+    const observer = getAlertSlotObserver();
+    alertsById = new Map(alerts.map(alert => [alert.alert_id, alert]));
+
+    // Удаляем только слоты исчезнувших алертов
+    for (const [alertId, slot] of slotNodes) {
+        if (!alertsById.has(alertId)) {
+            observer.unobserve(slot);
+            slotNodes.delete(alertId);
+            cardNodes.delete(alertId);
+            pendingHighlights.delete(alertId);
+        }
+    }
+
+    if (alerts.length === 0) {
+        container.innerHTML = '<div class="no-alerts">Создайте первый алерт для начала работы</div>';
+        return;
+    }
+
+    const slots = alerts.map(alert => {
+        const alertId = alert.alert_id;
+        let slot = slotNodes.get(alertId);
+        if (!slot) {
+            slot = document.createElement('div');
+            slot.className = 'alert-slot';
+            slot.dataset.alertId = alertId;
+            slot.style.height = ALERT_SLOT_HEIGHT + 'px';
+            slotNodes.set(alertId, slot);
+            observer.observe(slot);
+        } else if (cardNodes.has(alertId)) {
+            patchAlertCard(cardRefs.get(cardNodes.get(alertId)), alert);
+        }
+        return slot;
+    });
+    reconcileChildren(container, slots);
+}
+
+// Делегированные обработчики сетки: по одному на весь #alertsGrid вместо
+// замыканий на каждую карточку и каждый тег блеклиста
+function onAlertsGridClick(event) {
+    const target = event.target.closest('.remove-btn, .add-blacklist-btn, .btn-danger');
+    if (!target) return;
+    const card = target.closest('.alert-card');
+    if (!card) return;
+    const alertId = card.dataset.alertId;
+
+    if (target.classList.contains('remove-btn')) {
+        removeFromBlacklist(alertId, target.dataset.ticker);
+    } else if (target.classList.contains('add-blacklist-btn')) {
+        addTickerToBlacklist(alertId);
+    } else {
+        deleteAlert(alertId);
+    }
+}
+
+function onAlertsGridKeydown(event) {
+    if (event.key !== 'Enter' || !event.target.classList.contains('blacklist-input')) return;
+    const card = event.target.closest('.alert-card');
+    if (card) addTickerToBlacklist(card.dataset.alertId);
+}
+
+function addTickerToBlacklist(alertId) {
+    const card = cardNodes.get(alertId);
+    if (!card) return;
+
+    const input = card.querySelector('.blacklist-input');
+    const ticker = input.value.trim().toUpperCase();
+    
+    if (ticker) {
+        addToBlacklist(alertId, ticker);
+        input.value = '';
+    }
+}
+
+async function deleteAlert(alertId) {
+    if (!userId) return;
+
+    try {
+        const response = await fetch(`/alerts/${alertId}?user_id=${userId}`, {
+            method: 'DELETE'
+        });
+
+        const result = await response.json();
+        
+        if (response.ok) {
+            showSystemMessage('Алерт удален: ' + alertId, 'success');
+            // Clean up blacklist
+            delete alertBlacklists[alertId];
+            blacklistTextCache.delete(alertId);
+            saveBlacklists(alertId);
+            removeMyAlert(alertId);
+        } else {
+            showSystemMessage('Ошибка: ' + result.detail, 'error');
+        }
+    } catch (error) {
+        showSystemMessage('Ошибка удаления алерта: ' + error.message, 'error');
+    }
+}
+
+async function deleteAllAlerts() {
+    if (!userId) return;
+    
+    if (!confirm('Вы уверены, что хотите удалить все алерты?')) {
+        return;
+    }
+
+    try {
+        const response = await fetch(`/alerts?user_id=${userId}`, {
+            method: 'DELETE'
+        });
+
+        const result = await response.json();
+        
+        if (response.ok) {
+            showSystemMessage(`Удалено алертов: ${result.removed_count}`, 'success');
+            // Clean up all blacklists for this user
+            for (const alertId of Object.keys(alertBlacklists)) {
+                saveBlacklists(alertId);
+            }
+            alertBlacklists = {};
+            blacklistTextCache.clear();
+            renderMyAlerts([]);
+        } else {
+            showSystemMessage('Ошибка: ' + result.detail, 'error');
+        }
+    } catch (error) {
+        showSystemMessage('Ошибка удаления всех алертов: ' + error.message, 'error');
+    }
+}
+
+// WebSocket Commands
+function sendPing() {
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({type: 'ping'}));
+    }
+}
+
+function getStatus() {
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({type: 'get_status'}));
+    }
+}
+
+// UI Updates
+// Значения счетчиков копятся в буфере и пишутся в DOM не чаще раза за кадр
+const statBuffer = {};
+let statRafId = null;
+
+function updateStat(elementId, value) {
+    statBuffer[elementId] = value;
+    if (statRafId === null) {
+        statRafId = requestAnimationFrame(flushStats);
+    }
+}
+
+// Узлы счетчиков и последние выведенные значения: элемент ищется один
+// раз, а текст пишется только если число действительно изменилось
+const statNodes = new Map();
+
+function flushStats() {
+    statRafId = null;
+    for (const elementId in statBuffer) {
+        const value = String(statBuffer[elementId]);
+        delete statBuffer[elementId];
+
+        let node = statNodes.get(elementId);
+        if (!node) {
+            node = document.getElementById(elementId);
+            statNodes.set(elementId, node);
+        }
+        if (node.textContent !== value) {
+            node.textContent = value;
+        }
+    }
+}
+
+function updateStats(data) {
+    connectedUsers = data.connected_users || 0;
+    updateStat('connectedUsers', connectedUsers);
+    showSystemMessage(`Статус обновлен: ${data.your_alerts} ваших алертов, ${data.total_alerts} всего`, 'info');
+}
+
+function updateActiveAlertsCount(count) {
+    updateStat('activeAlertsCount', count);
+}
+
+function updateTriggeredCount() {
+    updateStat('triggeredCount', triggeredToday);
+}
+
+// Toast уведомления: небольшой пул постоянных элементов вместо
+// создания и удаления <div> на каждое сообщение. Слоты выбираются по
+// кругу, позиция слота задается один раз при создании.
+const TOAST_POOL_SIZE = 5;
+const TOAST_DURATION_MS = 3000;
+let toastPool = null;
+let toastNext = 0;
+
+function getToastPool() {
+    if (!toastPool) {
+        toastPool = Array.from({ length: TOAST_POOL_SIZE }, (_, slot) => {
+            const el = document.createElement('div');
+            el.className = 'toast';
+            el.hidden = true;
+            el.style.top = (20 + slot * 56) + 'px';
+            el.addEventListener('animationend', () => {
+                if (el.classList.contains('is-hiding')) el.hidden = true;
+            });
+            document.body.appendChild(el);
+            return { el, timer: null };
+        });
+    }
+    return toastPool;
+}
+
+function showSystemMessage(message, type) {
+    const pool = getToastPool();
+    const toast = pool[toastNext];
+    toastNext = (toastNext + 1) % TOAST_POOL_SIZE;
+
+    clearTimeout(toast.timer);
+    toast.el.textContent = message;
+    toast.el.className = `toast ${type}`;
+    toast.el.hidden = false;
+    toast.timer = setTimeout(() => toast.el.classList.add('is-hiding'), TOAST_DURATION_MS);
+}
+
+// Частые pong не засоряют экран тостами: только мигает точка статуса
+function flashStatusDot() {
+    const statusEl = document.getElementById('status');
+    if (statusEl.classList.contains('pulse')) return;
+    statusEl.classList.add('pulse');
+    statusEl.addEventListener('animationend', () => statusEl.classList.remove('pulse'), { once: true });
+}
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    loadBlacklists();
+    updateTriggeredCount();
+
+    const alertsGrid = document.getElementById('alertsGrid');
+    alertsGrid.addEventListener('click', onAlertsGridClick);
+    alertsGrid.addEventListener('keydown', onAlertsGridKeydown);
+    document.getElementById('myAlertsPanel').addEventListener('toggle', onMyAlertsPanelToggle);
+    updateStat('connectedUsers', connectedUsers);
+    // Первый замер контейнера - при загрузке, а не внутри пачки записей
+    initTriggeredView();
+
+    const whenIdle = window.requestIdleCallback || (cb => setTimeout(cb, 200));
+    whenIdle(() => loadHelpModal().catch(() => {}));
+});
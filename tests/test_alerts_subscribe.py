@@ -0,0 +1,64 @@
+from typing import Set
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.alerts import router as alerts_router
+from modules.composite.manager import CompositeListenerManager
+
+
+class _StubListener:
+    """Слушатель без фоновой задачи: только подписчики и выражение."""
+
+    def __init__(self, user_id: int) -> None:
+        self.subscribers: Set[int] = {user_id}
+        self.readable_expression = "price > 5 300"
+
+    def add_subscriber(self, user_id: int) -> None:
+        self.subscribers.add(user_id)
+
+    def remove_subscriber(self, user_id: int) -> None:
+        self.subscribers.discard(user_id)
+
+
+@pytest.fixture
+def manager():
+    CompositeListenerManager._instance = None
+    manager = CompositeListenerManager.instance()
+    manager._listeners["42"] = _StubListener(1)
+    manager._total_subscribers = 1
+    yield manager
+    CompositeListenerManager._instance = None
+
+
+@pytest.fixture
+def client(manager):
+    app = FastAPI()
+    app.include_router(alerts_router)
+    return TestClient(app)
+
+
+def test_subscribe_shows_up_in_user_alerts(client, manager):
+    # Прогреваем кэш подписок пользователя пустым результатом
+    assert client.get("/alerts", params={"user_id": 2}).json() == []
+
+    response = client.post("/alerts/42/subscribe", params={"user_id": 2})
+    assert response.json()["success"] is True
+
+    alerts = client.get("/alerts", params={"user_id": 2}).json()
+    assert [alert["alert_id"] for alert in alerts] == ["42"]
+    assert alerts[0]["subscribers_count"] == 2
+    assert manager.total_subscribers == 2
+
+
+def test_unsubscribe_after_subscribe_keeps_total(client, manager):
+    client.post("/alerts/42/subscribe", params={"user_id": 2})
+    client.delete("/alerts/42", params={"user_id": 2})
+    assert manager.total_subscribers == 1
+
+
+def test_repeated_subscribe_is_rejected(client):
+    client.post("/alerts/42/subscribe", params={"user_id": 2})
+    response = client.post("/alerts/42/subscribe", params={"user_id": 2})
+    assert response.json()["success"] is False
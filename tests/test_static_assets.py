@@ -0,0 +1,25 @@
+import pytest
+
+from api.static_assets import StaticAsset
+
+
+@pytest.fixture(scope="module")
+def asset():
+    return StaticAsset(b"body { color: red; }" * 10, "text/css; charset=utf-8")
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("", "identity"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=0", "identity"),
+        ("*;q=0", "identity"),
+        ("*, br;q=0", "gzip"),
+        ("gzip;q=1, br;q=0.5", "gzip"),
+        ("br;q=0.8, gzip;q=0.8", "br"),
+    ],
+)
+def test_pick_encoding_honours_q_values(asset, accept_encoding, expected):
+    assert asset._pick_encoding(accept_encoding) == expected
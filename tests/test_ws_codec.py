@@ -0,0 +1,19 @@
+import datetime as dt
+
+import msgpack
+
+from api.ws_codec import encode_msgpack
+
+
+def _decode_timestamp(value: dt.datetime) -> str:
+    return msgpack.unpackb(encode_msgpack({"timestamp": value}))["timestamp"]
+
+
+def test_naive_datetime_is_treated_as_utc():
+    assert _decode_timestamp(dt.datetime(2024, 1, 1, 12, 0)) == "2024-01-01T12:00:00Z"
+
+
+def test_aware_datetime_is_converted_to_utc():
+    moscow = dt.timezone(dt.timedelta(hours=3))
+    value = dt.datetime(2024, 1, 1, 15, 0, tzinfo=moscow)
+    assert _decode_timestamp(value) == "2024-01-01T12:00:00Z"